@@ -0,0 +1,424 @@
+#!/usr/bin/env python
+
+"""
+Performance benchmarks, run all of them with ./benchmarks.py or pick some by name: ./benchmarks.py tokenizer
+"""
+import os
+import re
+import sys
+import tempfile
+import tracemalloc
+from array import array
+from fractions import Fraction
+from os import cpu_count
+from random import Random
+from timeit import timeit
+
+from computor_v1 import symbols
+from mathematics import bisection
+from mathematics.backends import DECIMAL, EXACT, decimal
+from mathematics.convolution import karatsuba, kronecker, schoolbook
+from mathematics.numbers import Complex, Real
+from mathematics.polynomial import Polynomial, solve_quadratics
+from mathematics.roots import iterations, sqrt
+from mathematics.solvers import aberth, solve
+from parser.batch import run_batch
+from parser.compiler import Compiler
+from parser.computor import Computor
+from parser.symbols import Equals
+
+
+def measure(label, fn, number):
+    """Print the average time of a single fn call in microseconds"""
+    seconds = timeit(fn, number=number)
+    print(f"{label:<48} {seconds / number * 1e6:12.2f} us")
+    return seconds / number
+
+
+def bench_tokenizer():
+    """Scanning short equations with the cached lexer vs building the regex on every call"""
+    computor = Computor(symbols=symbols)
+    text = '5 * X^0 + 4 * X^1 - 9.3 * X^2 = 1 * X^0'
+
+    def scan_uncompiled():
+        token_regex = r'\s*' + r'|'.join([f'(?P<{x.id()}>{x.pattern})' for x in computor.symbols.values()])
+        return [match.lastgroup for match in re.finditer(token_regex, text)]
+
+    def scan_compiled():
+        return [match.lastgroup for match in computor.lexer.regex.finditer(text)]
+
+    before = measure("scan, regex rebuilt per call", scan_uncompiled, 20000)
+    after = measure("scan, cached lexer", scan_compiled, 20000)
+    print(f"{'saved per parse':<48} {(before - after) * 1e6:12.2f} us")
+    # re caches compiled patterns too, only building the pattern and looking it up are saved
+    measure("whole parse, for comparison", lambda: computor.parse(text), 2000)
+
+
+def peak_memory(fn):
+    """Return the peak memory allocated during the fn call in KiB"""
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak / 1024
+
+
+def long_polynomial(terms):
+    return ' + '.join(f'{n % 97} * X^{n % 3}' for n in range(terms)) + ' = 0'
+
+
+def bench_compact_tokens():
+    """Tokenizing a long polynomial into symbol instances vs compact arrays"""
+    computor = Computor(symbols=symbols)
+    text = long_polynomial(20000)
+
+    for label, fn in [
+        ("symbol instances", lambda: computor.lexer.tokenize(computor, text)),
+        ("compact arrays", lambda: computor.lexer.scan(text)),
+    ]:
+        measure(f"tokenize 20k terms, {label}", fn, 5)
+        print(f"{'  peak memory':<48} {peak_memory(fn):12.0f} KiB")
+
+    measure("parse 20k terms", lambda: computor.parse(text), 5)
+
+
+def bench_polynomial():
+    """Solving a 10k terms equation: reducing it once for all, then reusing the reduced form"""
+    computor = Computor(symbols=symbols)
+    computor.parse(' + '.join(f'{n % 97} * X^{n % 3}' for n in range(10000)) + ' = 0')
+    terms = computor.result.terms
+
+    measure("solution_text 10k terms, first call", lambda: Polynomial(terms=terms).solution_text, 5)
+    computor.result.solution_text, hash(computor.result)
+    measure("solution_text 10k terms, cached", lambda: computor.result.solution_text, 10000)
+    measure("hash 10k terms, cached", lambda: hash(computor.result), 10000)
+
+
+def bench_sparse():
+    """Summing 20k redundant terms and multiplying multivariate polynomials, kept as sparse monomials"""
+    computor = Computor(symbols=symbols)
+    text = long_polynomial(20000)
+
+    measure("parse 20k terms, 3 distinct monomials", lambda: computor.parse(text), 5)
+    print(f"{'  peak memory':<48} {peak_memory(lambda: computor.parse(text)):12.0f} KiB")
+    print(f"{'  monomials kept':<48} {len(computor.result.monomials):12}")
+
+    measure("(x + y + z + 1)^8", lambda: computor.parse('(x + y + z + 1)^8 = 0'), 5)
+    print(f"{'  monomials kept':<48} {len(computor.result.monomials):12}")
+
+
+def bench_power():
+    """Expanding powers: binomials by the binomial theorem, few terms by the multinomial theorem, others by squaring"""
+    computor = Computor(symbols=symbols)
+    for text in ['(x + 1)^100', '(x + 1)^2000', '(2 * x - 3)^5000', '(x + y)^2000', '(x + y + z + 1)^20',
+                 '(x^2 + x + 1)^1000', '(x^3 - 2 * x + 5)^300']:
+        measure(text, lambda: computor.parse(f'{text} = 0'), 1)
+
+
+def bench_number_power():
+    """Powers of numbers: native integer powers, complex powers by squaring and modular powers"""
+    def repeated(number, power):
+        result = Complex(1)
+        for _ in range(power):
+            result = result * number
+        return result
+
+    measure("2^900, repeated multiplication", lambda: repeated(Complex(2), 900), 100)
+    measure("2^900", lambda: Complex(2) ** 900, 10000)
+    measure("2^5000", lambda: Complex(2) ** 5000, 10000)
+    measure("(1 + i)^1001, repeated multiplication", lambda: repeated(Complex(real=1, imag=1), 1001), 100)
+    measure("(1 + i)^1001", lambda: Complex(real=1, imag=1) ** 1001, 10000)
+    measure("3^(10^18) mod 1000000007", lambda: pow(Complex(3), 10 ** 18, 1000000007), 10000)
+    measure("(2 + 3i)^(10^18) mod 1000000007", lambda: pow(Complex(real=2, imag=3), 10 ** 18, 1000000007), 1000)
+
+
+def bench_complex():
+    """Arithmetic throughput of the home-made numbers, real and complex, with numbers and native operands"""
+    a, b, z, w = Real(3), Real(2.5), Complex(real=1, imag=2), Complex(real=-0.5, imag=3)
+
+    def arithmetic(x, y):
+        for _ in range(1000):
+            (x + y) * x - y / x
+            -x + 2 * x - 1
+            x < y
+
+    measure("Real construction", lambda: [Real(n) for n in range(1000)], 100)
+    measure("Real arithmetic", lambda: arithmetic(a, b), 100)
+    measure("Complex arithmetic", lambda: arithmetic(z, w), 100)
+    measure("Mixed arithmetic", lambda: arithmetic(a, w), 100)
+
+
+def bench_roots():
+    """Square roots by the bisection on the [0, n] interval vs the Newton's method, with the iterations made"""
+    for n in [2, 12345.678, 1e10, 10 ** 20, 0.36]:
+        calls = []
+
+        def fn(x):
+            calls.append(x)
+            return x * x - n
+
+        bisection(fn, 0, n)
+        before = sum(iterations.values())
+        sqrt(n)
+        print(f"{n:g}: bisection {len(calls)} evaluations, error {abs(calls[-1] - n ** 0.5):.1e}; "
+              f"Newton {sum(iterations.values()) - before} iterations, error {abs(sqrt(n) - n ** 0.5):.1e}")
+        measure("  bisection", lambda: bisection(lambda x: x * x - n, 0, n), 100)
+        measure("  Newton", lambda: sqrt(n), 10000)
+
+
+def bench_closed_forms():
+    """Solving cubic and quartic equations by the Cardano's and Ferrari's formulas, from parsing to the solutions"""
+    computor = Computor(symbols=symbols)
+    for text in ['8 - 6 * X - 5.6 * X^3 = 3', '(X - 1) * (X - 2) * (X - 3) = 0', 'X^4 + 1 = 0',
+                 '(X^2 + 1) * (X - 2) * (X + 3) = 0']:
+        computor.parse(text)
+        dense = computor.result.dense
+        # A new polynomial every time, not to reuse its cached coefficients
+        measure(f"solve {text}", lambda: Polynomial(dense=dense).resolve(), 1000)
+        measure("  from the text", lambda: computor.execute(text), 1000)
+
+
+def bench_aberth():
+    """
+    All the roots of random polynomials of high degrees at once by the Aberth-Ehrlich method, with the iterations made
+    """
+    random = Random(5)
+    for degree in [5, 50, 500, 5000]:
+        coeffs = [Complex(random.randint(-9, 9)) for _ in range(degree)] + [Complex(1)]
+        before = iterations['aberth']
+        # A single run at high degrees, the method being quadratic in the degree
+        measure(f"degree {degree}", lambda: aberth(coeffs), 1 if degree > 500 else 10)
+        print(f"  {(iterations['aberth'] - before) // (1 if degree > 500 else 10)} iterations")
+
+
+def bench_exact_roots():
+    """Polynomials with rational or repeated roots, solved with the exact pre-pass vs numerically only"""
+    computor = Computor(symbols=symbols)
+    random = Random(6)
+    tests = ['(x + 1)^10 = 0', '(2 * x - 3)^3 * (x^2 - 2) = 0',
+             ' * '.join(f'(x - {random.randint(-50, 50)})' for _ in range(20)) + ' = 0',
+             ' + '.join(f'{random.randint(-9, 9)} * x^{degree}' for degree in range(200)) + ' + x^200 = 0']
+    for text in tests:
+        computor.parse(text)
+        dense = computor.result.dense
+        label = text if len(text) < 40 else text[:36] + '...'
+        measure(f"exact {label}", lambda: Polynomial(dense=dense).resolve(), 10)
+        measure("  numeric only", lambda: solve(Polynomial(dense=dense).coefficients), 10)
+
+
+def bench_sturm():
+    """Real roots of random polynomials by Sturm sequences vs all the complex roots by the Aberth-Ehrlich method"""
+    computor = Computor(symbols=symbols)
+    random = Random(8)
+    for degree in [10, 50, 100, 200]:
+        computor.parse(' + '.join(f'{random.randint(-9, 9)} * x^{k}' for k in range(degree)) + f' + x^{degree} = 0')
+        dense = computor.result.dense
+        polynomial = Polynomial(dense=dense)
+        print(f"degree {degree}: {polynomial.count_real_roots()} real roots")
+        number = 1 if degree > 50 else 10
+        measure("  Sturm chain", lambda: Polynomial(dense=dense).sturm, number)
+        measure("  count, chain built", lambda: polynomial.count_real_roots(), number)
+        measure("  count in (0, 1], chain built", lambda: polynomial.count_real_roots(0, 1), number)
+        measure("  isolate and refine, chain built", lambda: polynomial.real_roots(), number)
+        measure("  all the complex roots", lambda: solve(polynomial.coefficients), number)
+
+
+def bench_quadratics():
+    """Many quadratic equations solved from their texts one by one vs from columns of coefficients at once"""
+    computor = Computor(symbols=symbols)
+    random = Random(9)
+    rows = [(random.choice([-3, -1, 1, 2, 5]), random.randint(-99, 99), random.randint(-99, 99)) for _ in range(100000)]
+    texts = [f"{a} * X^2 + {b} * X + {c} = 0" for a, b, c in rows[:1000]]
+    measure("1000 texts by the computor", lambda: [computor.execute(text) for text in texts], 1)
+    a, b, c = (array('d', column) for column in zip(*rows))
+    measure("1000 columns rows", lambda: solve_quadratics(a[:1000], b[:1000], c[:1000]), 10)
+    measure("100000 columns rows", lambda: solve_quadratics(a, b, c), 1)
+
+
+def bench_dense():
+    """Evaluating a degree 1000 polynomial at 1000 points with the Horner's method, and summing it"""
+    computor = Computor(symbols=symbols)
+    computor.parse(' + '.join(f'{n % 7 - 3} * x^{n}' for n in range(1001)) + ' = 0')
+    dense = computor.result.dense
+    points = [n / 1000 for n in range(1000)]
+
+    measure("1000 points, one by one", lambda: [dense.evaluate(x) for x in points], 5)
+    measure("sum of two degree 1000 polynomials", lambda: computor.result + computor.result, 100)
+
+
+def bench_multiplication():
+    """
+    Multiplying polynomials of n coefficients with each algorithm, to choose the thresholds in mathematics.settings
+    """
+    random = Random(42)
+    for label, coeff in [("small ints", lambda: random.randint(-1000, 1000)),
+                         ("200 bits ints", lambda: random.getrandbits(200) - (1 << 199)),
+                         ("floats", lambda: random.uniform(-1000, 1000)),
+                         ("fractions", lambda: Fraction(random.randint(-999, 999), random.randint(1, 999)))]:
+        print(label)
+        for n in (16, 32, 64, 128, 256, 1024):
+            a, b = [coeff() for _ in range(n)], [coeff() for _ in range(n)]
+            number = max(1, 2000 // n)
+            times = [
+                f"{name} {timeit(lambda: fn(a, b), number=number) / number * 1e6:10.1f} us"
+                for name, fn in [("schoolbook", schoolbook), ("karatsuba", karatsuba), ("kronecker", kronecker)]
+                if fn(a, b) is not None
+            ]
+            print(f"  n = {n:<5} {'  '.join(times)}")
+
+    computor = Computor(symbols=symbols)
+    factor = '(' + ' + '.join(f'{n % 7 - 3} * x^{n}' for n in range(1000)) + ')'
+    measure("parse the product of two degree 1000 polynomials", lambda: computor.parse(f'{factor} * {factor} = 0'), 3)
+
+
+def bench_backends():
+    """Computations with each numeric backend, and products of fraction polynomials by each algorithm"""
+    computors = [("float", Computor(symbols=symbols)), ("decimal 50", Computor(symbols=symbols, backend=DECIMAL)),
+                 ("decimal 500", Computor(symbols=symbols, backend=decimal(500))),
+                 ("exact", Computor(symbols=symbols, backend=EXACT))]
+    for text in ['x^2 - 3 * x = 1', 'x = 0.1 + 0.2 - 0.3', '(x/3 + 1/7)^200 = 0', '(0.1 * x + 0.3 * y + 1)^20 = 0']:
+        for name, computor in computors:
+            measure(f"{name} {text}", lambda: computor.execute(text), 10)
+
+    random = Random(42)
+    a, b = ([Fraction(random.randint(-999, 999), random.randint(1, 999)) for _ in range(300)] for _ in range(2))
+    for name, fn in [("karatsuba", karatsuba), ("kronecker", kronecker)]:
+        measure(f"{name} product of 300 fractions polynomials", lambda: fn(a, b), 3)
+
+
+def bench_compiled():
+    """Evaluating one expression with many variable bindings, parsed every time vs compiled once"""
+    computor = Computor(symbols=symbols)
+    text = '3 * x^3 - 2 * x^2 * y + (x - y)^2 / 4 - 7'
+    bindings = [{'x': Real(n), 'y': Real(n % 7)} for n in range(1000)]
+
+    def parse_each():
+        for variables in bindings:
+            computor.variables = variables
+            computor.parse(text)
+
+    def evaluate_compiled():
+        expression = computor.compile(text)
+        for variables in bindings:
+            expression.evaluate(variables)
+
+    before = measure("1000 bindings, parse each time", parse_each, 5)
+    after = measure("1000 bindings, compiled expression", evaluate_compiled, 5)
+    print(f"{'speedup':<48} {before / after:12.2f} x")
+
+
+def bench_nesting():
+    """Parsing machine generated inputs nested 10k levels deep, beyond the Python recursion limit"""
+    computor = Computor(symbols=symbols)
+    depth = 10000
+
+    measure("10k nested parentheses", lambda: computor.parse('(' * depth + 'x' + ')' * depth + ' = 2'), 5)
+    measure("10k prefix minuses", lambda: computor.parse('-' * depth + '2 = x'), 5)
+    measure("10k right associative powers", lambda: computor.parse('x = 2' + '^1' * depth), 5)
+    measure("10k nested parentheses, compiling", lambda: Compiler(symbols).compile('(' * depth + '1' + ')' * depth), 5)
+
+
+def bench_summary():
+    """Assignment detection for every name of an equation with 50k occurrences of X"""
+    computor = Computor(symbols=symbols)
+    computor.text = ' + '.join(['X'] * 50000) + ' = 0'
+    measure("tokenize 50k names, with summary", computor.tokenize, 5)
+    equals = computor.lexer.codes[Equals]
+
+    before = measure("one lookup, scanning the tokens", lambda: equals in computor.kinds, 200)
+    after = measure("one lookup, summary", lambda: computor.contains(Equals), 50000)
+    print(f"{'50k lookups saved':<48} {(before - after) * 50000:12.2f} s")
+
+
+def bench_stream():
+    """Solving a 20k terms equation read at once vs streamed by chunks"""
+    computor = Computor(symbols=symbols)
+    text = long_polynomial(20000)
+
+    def parse_stream():
+        computor.parse_stream(text[i:i + 4096] for i in range(0, len(text), 4096))
+
+    for label, fn in [("whole text", lambda: computor.parse(text)), ("streamed", parse_stream)]:
+        measure(f"parse 20k terms, {label}", fn, 1)
+        print(f"{'  peak memory':<48} {peak_memory(fn):12.0f} KiB")
+
+
+def bench_batch():
+    """Solving 500 equations one after another vs across a process pool"""
+    lines = [f'{n % 13} * x^2 + {n % 7} * x - {n % 5} = x' for n in range(500)]
+    computor = Computor(symbols=symbols)
+
+    before = measure("500 equations, sequential", lambda: [computor.execute(line) for line in lines], 1)
+    after = measure(f"500 equations, pool of {cpu_count()} processes",
+                    lambda: list(run_batch(lines, symbols=symbols)), 1)
+    print(f"{'throughput':<48} {500 / after:12.0f} equations/s ({before / after:.2f} x)")
+
+
+def bench_cache():
+    """Solving 500 equations with many repetitions, without and with a result cache"""
+    lines = [f'{n % 5} * x^2 + {n % 3} * x = x - 1' if n % 2 else f'x - 1 = {n % 3} * x + x^2 * {n % 5}'
+             for n in range(500)]
+
+    for cache_size in (0, 64):
+        computor = Computor(symbols=symbols, cache_size=cache_size)
+
+        def execute_all():
+            for line in lines:
+                computor.variables = {}
+                computor.execute(line)
+
+        measure(f"500 equations, cache size {cache_size}", execute_all, 1)
+        if computor.cache is not None:
+            print(f"{'  cache':<48} {computor.cache}")
+
+
+def bench_disk_cache():
+    """Solving 500 equations with many repetitions across runs, with a cold and a warm disk cache"""
+    lines = [f'{n % 5} * x^2 + {n % 3} * x = x - 1' for n in range(500)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'cache.db')
+        for label, cache_size in [("cold disk cache", 0), ("warm disk cache", 0),
+                                  ("warm disk cache, memory in front", 64)]:
+            computor = Computor(symbols=symbols, cache_size=cache_size, cache_file=path)
+
+            def execute_all():
+                for line in lines:
+                    computor.variables = {}
+                    computor.execute(line)
+
+            measure(f"500 equations, {label}", execute_all, 1)
+            print(f"{'  cache':<48} {computor.cache}")
+
+
+BENCHMARKS = {
+    'tokenizer': bench_tokenizer,
+    'compact_tokens': bench_compact_tokens,
+    'polynomial': bench_polynomial,
+    'sparse': bench_sparse,
+    'power': bench_power,
+    'number_power': bench_number_power,
+    'complex': bench_complex,
+    'roots': bench_roots,
+    'closed_forms': bench_closed_forms,
+    'aberth': bench_aberth,
+    'exact_roots': bench_exact_roots,
+    'sturm': bench_sturm,
+    'quadratics': bench_quadratics,
+    'dense': bench_dense,
+    'multiplication': bench_multiplication,
+    'backends': bench_backends,
+    'compiled': bench_compiled,
+    'nesting': bench_nesting,
+    'summary': bench_summary,
+    'stream': bench_stream,
+    'batch': bench_batch,
+    'cache': bench_cache,
+    'disk_cache': bench_disk_cache,
+}
+
+
+if __name__ == '__main__':
+    for name in sys.argv[1:] or BENCHMARKS:
+        print(f"\n{name}")
+        BENCHMARKS[name]()
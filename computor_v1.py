@@ -4,8 +4,13 @@
 Simple program for finding polynomial roots
 """
 import readline
-from argparse import ArgumentParser
+import sys
+from argparse import ArgumentParser, FileType
+from time import perf_counter
 
+from mathematics.backends import BACKENDS, select
+from mathematics.settings import DECIMAL_PRECISION
+from parser.batch import run_batch
 from parser.computor import Computor
 from parser.symbols import *
 
@@ -17,18 +22,53 @@ symbols = (
     UndefinedToken,
 )
 
+# Size of the chunks an equation file is read by
+CHUNK_SIZE = 65536
+
+
+def read_chunks(file, size=CHUNK_SIZE):
+    return iter(lambda: file.read(size), '')
+
 
 def run():
     arg_parser = ArgumentParser(description="This program computes simple polynomial equations.")
     arg_parser.add_argument('equation_string', type=str, nargs='?', default=None, help="an equation to be solved")
+    arg_parser.add_argument('-f', '--file', type=FileType('r'), default=None,
+                            help="a file to read a (huge) equation from, - for the standard input")
+    arg_parser.add_argument('-b', '--batch', type=FileType('r'), default=None,
+                            help="a file to read many equations from, one per line, - for the standard input")
+    arg_parser.add_argument('-j', '--jobs', type=int, default=None,
+                            help="number of processes solving the batch equations, all CPUs by default")
+    arg_parser.add_argument('-n', '--numbers', choices=BACKENDS, default='float',
+                            help="numbers to compute with: floats by default, decimals or exact fractions")
+    arg_parser.add_argument('-p', '--precision', type=int, default=DECIMAL_PRECISION,
+                            help=f"significant digits of decimals, {DECIMAL_PRECISION} by default")
+    arg_parser.add_argument('-c', '--cache-size', type=int, default=0,
+                            help="number of results kept in memory for repeated equations, none by default")
+    arg_parser.add_argument('--cache-file', type=str, default=None,
+                            help="a SQLite database keeping results on disk across runs, shared by all processes; "
+                                 "it should be writable by trusted users only")
     args = arg_parser.parse_args()
 
     readline.parse_and_bind('"\\C-p": previous-history')
     readline.parse_and_bind('"\\C-n": next-history')
 
-    computor = Computor(symbols=symbols)
+    backend = select(args.numbers, args.precision)
+
+    if args.batch:
+        start, count = perf_counter(), 0
+        for output in run_batch(args.batch, symbols=symbols, jobs=args.jobs,
+                                cache_size=args.cache_size, cache_file=args.cache_file, backend=backend):
+            print(output)
+            count += 1
+        seconds = perf_counter() - start
+        print(f"Solved {count} equations in {seconds:.2f}s ({count / seconds:.0f} equations/s)", file=sys.stderr)
+        return
 
-    if args.equation_string:
+    computor = Computor(symbols=symbols, cache_size=args.cache_size, cache_file=args.cache_file, backend=backend)
+    if args.file:
+        computor.run(interactive=False, chunks=read_chunks(args.file))
+    elif args.equation_string:
         computor.run(args.equation_string, interactive=False)
     else:
         print("Running Computor in the interactive mode")
@@ -6,21 +6,33 @@ Simple yet powerful mathematics language interpreter
 import readline
 from argparse import ArgumentParser
 
+from mathematics.backends import BACKENDS, select
+from mathematics.settings import DECIMAL_PRECISION
 from parser.computor import Computor
 
 
 def run():
     arg_parser = ArgumentParser(description="This is a simple yet powerful mathematics language interpreter.")
     arg_parser.add_argument('expression_string', type=str, nargs='?', default=None, help="an expression to be solved")
+    arg_parser.add_argument('-n', '--numbers', choices=BACKENDS, default='float',
+                            help="numbers to compute with: floats by default, decimals or exact fractions")
+    arg_parser.add_argument('-p', '--precision', type=int, default=DECIMAL_PRECISION,
+                            help=f"significant digits of decimals, {DECIMAL_PRECISION} by default")
+    arg_parser.add_argument('-c', '--cache-size', type=int, default=0,
+                            help="number of results kept in memory for repeated expressions, none by default")
+    arg_parser.add_argument('--cache-file', type=str, default=None,
+                            help="a SQLite database keeping results on disk across runs, shared by all processes; "
+                                 "it should be writable by trusted users only")
     args = arg_parser.parse_args()
 
     readline.parse_and_bind('"\\C-p": previous-history')
     readline.parse_and_bind('"\\C-n": next-history')
 
-    computor = Computor()
+    computor = Computor(cache_size=args.cache_size, cache_file=args.cache_file,
+                        backend=select(args.numbers, args.precision))
 
     if args.expression_string:
-        computor.run(args.equation_string, interactive=False)
+        computor.run(args.expression_string, interactive=False)
     else:
         print("Running Computor in the interactive mode")
         computor.run()
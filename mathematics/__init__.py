@@ -1,3 +1,3 @@
 from .settings import *
-from .basic import abs, is_integer, parse_number, round
-from .algo import bisection
+from .basic import abs, format_number, is_integer, parse_number, round
+from .algo import bisection, illinois
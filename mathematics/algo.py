@@ -1,8 +1,12 @@
-from mathematics import DEFAULT_ERROR, DEFAULT_ITERATIONS
+import struct
+from decimal import Decimal
+from math import copysign
+
+from mathematics.backends import active
 from mathematics.exceptions import MathError
 
 
-def bisection(fn, a, b, precision=DEFAULT_ERROR, max_iterations=DEFAULT_ITERATIONS):
+def bisection(fn, a, b, precision=None, max_iterations=None):
     """
     This function finds an equation root on the given interval,
     using the bisection (i.e. binary search, dichotomy) method.
@@ -11,18 +15,106 @@ def bisection(fn, a, b, precision=DEFAULT_ERROR, max_iterations=DEFAULT_ITERATIO
     :param fn: a function such that f(x) = 0, e.g. lambda x: x^2 - 4
     :param a: start endpoint, i.e. 0
     :param b: final endpoint, i.e. 4
-    :param precision: acceptable precision error, i.e. 0.0000001
-    :param max_iterations: maximum iterations number to prevent infinite looping
+    :param precision: acceptable precision error, i.e. 0.0000001, the error of the active backend by default
+    :param max_iterations: maximum iterations number to prevent infinite looping,
+                           the one of the active backend by default
     :return: the equation root found
     """
+    backend = active()
+    precision = backend.error if precision is None else precision
+    max_iterations = backend.iterations if max_iterations is None else max_iterations
     for i in range(0, max_iterations):
         mid = (a + b) / 2
+        value = fn(mid)
 
-        if fn(mid) == 0 or (b - a) / 2 < precision:
+        if value == 0 or (b - a) / 2 < precision:
             return mid
-        elif fn(mid) > 0:
+        elif value > 0:
             b = mid
         else:
             a = mid
 
     raise MathError(f"Could not found any solution in {max_iterations} iterations")
+
+
+def illinois(fn, a, b, precision=None, max_iterations=None):
+    """
+    This function finds an equation root on the given interval, where the function changes its sign,
+    using the Illinois variant of the regula falsi (false position) method: the next point is where the line
+    through both ends crosses zero, and the value kept at an end that stays twice is halved,
+    so that both ends close in on the root superlinearly. See the page https://en.wikipedia.org/wiki/Regula_falsi
+
+    :param fn: a function such that f(x) = 0, with f(a) and f(b) of opposite signs
+    :param a: start endpoint
+    :param b: final endpoint
+    :param precision: acceptable precision error, the error of the active backend by default
+    :param max_iterations: maximum iterations number to prevent infinite looping,
+                           the one of the active backend by default
+    :return: the equation root found
+    """
+    backend = active()
+    precision = backend.error if precision is None else precision
+    max_iterations = backend.iterations if max_iterations is None else max_iterations
+    fa, fb = fn(a), fn(b)
+    if fa == 0:
+        return a
+    if fb == 0:
+        return b
+    if (fa > 0) == (fb > 0):
+        raise MathError("The function has the same sign at both endpoints")
+
+    side = 0
+    for i in range(0, max_iterations):
+        # The ratio first, so that huge values do not overflow
+        c = b - (b - a) * (fb / (fb - fa))
+        if c in (a, b):
+            # The step is below the numbers resolution: the next number toward the other end,
+            # unless both ends are next to each other already
+            c = next_toward(c, b if c == a else a)
+            if c in (a, b):
+                return c
+        fc = fn(c)
+
+        if fc == 0 or abs(b - a) < precision:
+            return c
+        elif (fc > 0) == (fb > 0):
+            b, fb = c, fc
+            if side == -1:
+                fa /= 2
+            side = -1
+        else:
+            a, fa = c, fc
+            if side == 1:
+                fb /= 2
+            side = 1
+
+    raise MathError(f"Could not found any solution in {max_iterations} iterations")
+
+
+try:
+    from math import nextafter
+except ImportError:
+    # Python 3.8, see next_float
+    nextafter = None
+
+
+def next_toward(x, y):
+    """The number next to x toward y, in decimals or floats"""
+    if isinstance(x, Decimal):
+        return x.next_toward(y)
+    return nextafter(x, y) if nextafter is not None else next_float(x, y)
+
+
+def next_float(x, y):
+    """
+    The float next to x toward y, stepping the bits of x as an integer: floats of a sign are ordered as their bits,
+    the magnitude growing with them
+    """
+    x, y = float(x), float(y)
+    if x == y:
+        return y
+    if x == 0:
+        return copysign(5e-324, y)
+    bits, = struct.unpack('<q', struct.pack('<d', x))
+    bits += 1 if (y > x) == (x > 0) else -1
+    return struct.unpack('<d', struct.pack('<q', bits))[0]
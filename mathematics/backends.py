@@ -0,0 +1,69 @@
+"""
+Numeric backends: the type of the numbers computations are made with, chosen per computor
+"""
+from collections import namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from decimal import Decimal, localcontext
+from fractions import Fraction
+
+from mathematics.settings import DECIMAL_PRECISION, DEFAULT_ERROR, DEFAULT_ITERATIONS
+
+
+class Backend(namedtuple('Backend', ['name', 'convert', 'precision', 'error', 'iterations'])):
+    """
+    Numeric backend, e.g. for decimal numbers of 50 digits:
+
+    name: 'decimal' (see BACKENDS)
+    convert: Decimal, converting the text of a number literal to a real number of the backend
+    precision: 50, the number of significant digits of decimal numbers, None for the other backends
+    error: Decimal('1E-50'), the acceptable error of approximating algorithms, see mathematics.algo
+    iterations: the maximum iterations number of approximating algorithms
+
+    Only decimal numbers need an active backend to get their precision, the others compute the same way anywhere,
+    so computations with floats have no overhead.
+    """
+
+    @contextmanager
+    def activated(self):
+        """Make it the active backend, see active, while computing"""
+        token = ACTIVE.set(self)
+        try:
+            if self.precision is None:
+                yield self
+            else:
+                with localcontext() as context:
+                    context.prec = self.precision
+                    yield self
+        finally:
+            ACTIVE.reset(token)
+
+    def rational(self, x):
+        """An integer or a fraction as a number of the backend: exact, or a decimal to the backend precision"""
+        if self.precision is not None:
+            return Decimal(x.numerator) / x.denominator
+        return x.numerator if x.denominator == 1 else Fraction(x)
+
+
+def decimal(precision=DECIMAL_PRECISION):
+    """Backend of decimal numbers with the given number of significant digits"""
+    return Backend('decimal', Decimal, precision, Decimal(f'1e-{precision}'), DEFAULT_ITERATIONS)
+
+
+def select(name, precision=DECIMAL_PRECISION):
+    """Return the backend of the given name (see BACKENDS), decimal numbers getting the given precision"""
+    return decimal(precision) if name == 'decimal' else BACKENDS[name]
+
+
+FLOAT = Backend('float', float, None, DEFAULT_ERROR, DEFAULT_ITERATIONS)
+EXACT = Backend('exact', Fraction, None, DEFAULT_ERROR, DEFAULT_ITERATIONS)
+DECIMAL = decimal()
+
+BACKENDS = {x.name: x for x in (FLOAT, DECIMAL, EXACT)}
+
+# The backend of the current computation
+ACTIVE = ContextVar('backend', default=FLOAT)
+
+
+def active():
+    return ACTIVE.get()
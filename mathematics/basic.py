@@ -1,6 +1,9 @@
 """
 Basic math operations
 """
+from decimal import Decimal, getcontext
+from fractions import Fraction
+
 from mathematics import DEFAULT_ERROR
 
 
@@ -11,17 +14,25 @@ def abs(a):
 def is_integer(a):
     from mathematics.numbers import Complex
 
+    if isinstance(a, Fraction):
+        return a.denominator == 1
+    if isinstance(a, Decimal):
+        return a.is_finite() and a == a.to_integral_value()
     return isinstance(a, int) or isinstance(a, (float, Complex)) and a.is_integer()
 
 
 def parse_number(n):
-    """Convert object number type to builtin"""
+    """Convert object number type to builtin, fractions and decimals stay as they are unless integral"""
     from mathematics.numbers import Complex
 
     if isinstance(n, int):
         return n
     if isinstance(n, float):
         return int(n) if n.is_integer() else n
+    if isinstance(n, Fraction):
+        return n.numerator if n.denominator == 1 else n
+    if isinstance(n, Decimal):
+        return int(n) if is_integer(n) else n
     if isinstance(n, Complex):
         if n.imag:
             raise ValueError
@@ -42,3 +53,20 @@ def round(n, precision=DEFAULT_ERROR):
         return base
     else:
         return n
+
+
+def format_number(n, format_spec='g'):
+    """
+    Format a real number, integers too big for floats get the same format as floats.
+    Fractions are only converted to floats here, when shown, decimals are shown with all their significant digits
+    """
+    if isinstance(n, Decimal) and n.is_finite():
+        # Zero without its sign, integral decimals without their exponent, 1E+1 is 10
+        n = n.normalize() if n else Decimal(0)
+        if n.as_tuple().exponent > 0 and n.adjusted() < getcontext().prec:
+            n = n.quantize(1)
+    try:
+        return format(float(n) if isinstance(n, Fraction) else n, format_spec)
+    except OverflowError:
+        n = Decimal(n.numerator) / Decimal(n.denominator) if isinstance(n, Fraction) else Decimal(n)
+        return format(n, '.6g' if format_spec == 'g' else format_spec)
@@ -1,5 +1,5 @@
-from mathematics.numbers import Complex
+from mathematics.numbers import I
 
 CONSTANTS = {
-    'i': Complex(real=0, imag=1),
+    'i': I,
 }
@@ -0,0 +1,161 @@
+"""
+Multiplication of dense coefficient lists, i.e. the convolution of the lists
+"""
+from decimal import Decimal
+from fractions import Fraction
+from functools import reduce
+from math import gcd, isfinite
+from numbers import Integral
+from operator import add
+
+from mathematics import KARATSUBA_THRESHOLD, KRONECKER_THRESHOLD
+
+
+def convolve(a, b):
+    """
+    Return the product of two polynomials given as non-empty lists of coefficients from degree 0,
+    using the fastest algorithm for their sizes (see the thresholds in mathematics.settings):
+    schoolbook for small polynomials, Karatsuba for medium ones, Kronecker substitution for big ones
+    """
+    size = min(len(a), len(b))
+    if size < KARATSUBA_THRESHOLD:
+        return schoolbook(a, b)
+    if size >= KRONECKER_THRESHOLD:
+        product = kronecker(a, b)
+        if product is not None:
+            return product
+    return karatsuba(a, b)
+
+
+def schoolbook(a, b):
+    """O(n·m) product, multiplying the coefficients of b by each coefficient of a row by row"""
+    size = len(b)
+    product = [0] * (len(a) + size - 1)
+    for degree, coeff in enumerate(a):
+        if coeff != 0:
+            product[degree:degree + size] = map(add, product[degree:degree + size], [coeff * x for x in b])
+    return product
+
+
+def karatsuba(a, b):
+    """
+    O(n^1.58) product: with a = a0 + a1·x^m and b = b0 + b1·x^m, the product only needs three half size products,
+    a0·b0, a1·b1 and (a0 + a1)·(b0 + b1). See the page https://en.wikipedia.org/wiki/Karatsuba_algorithm
+    """
+    if len(a) < len(b):
+        a, b = b, a
+    if len(b) < KARATSUBA_THRESHOLD:
+        return schoolbook(a, b)
+
+    m = len(a) // 2
+    a0, a1 = a[:m], a[m:]
+    product = [0] * (len(a) + len(b) - 1)
+
+    if len(b) <= m:
+        # Unbalanced sizes: a·b = a0·b + a1·b·x^m
+        accumulate(product, karatsuba(a0, b), 0)
+        accumulate(product, karatsuba(a1, b), m)
+        return product
+
+    b0, b1 = b[:m], b[m:]
+    low, high = karatsuba(a0, b0), karatsuba(a1, b1)
+    middle = karatsuba(sum_lists(a0, a1), sum_lists(b0, b1))
+    accumulate(middle, low, 0, -1)
+    accumulate(middle, high, 0, -1)
+
+    accumulate(product, low, 0)
+    accumulate(product, middle, m)
+    accumulate(product, high, 2 * m)
+    return product
+
+
+def kronecker(a, b):
+    """
+    Exact product by Kronecker substitution: both polynomials are evaluated at a big enough power of two,
+    so that their integer coefficients become the digits of two big integers,
+    then the digits of the product of these integers are the coefficients of the product.
+    The big integers product is the work of the python integers implementation.
+
+    Floats, decimals and fractions are exactly scaled to integers first, so that fractions are only reduced
+    and decimals rounded once in the end, complex numbers are computed by their real and imaginary parts.
+    Return None when the coefficients are not all finite numbers.
+    """
+    if any(isinstance(x, complex) for x in a) or any(isinstance(x, complex) for x in b):
+        a_real, a_imag = [complex(x).real for x in a], [complex(x).imag for x in a]
+        b_real, b_imag = [complex(x).real for x in b], [complex(x).imag for x in b]
+        # Gauss's trick: three real products instead of four
+        k1 = kronecker(b_real, sum_lists(a_real, a_imag))
+        k2 = kronecker(a_real, [y - x for x, y in zip(b_real, b_imag)])
+        k3 = kronecker(a_imag, sum_lists(b_real, b_imag))
+        if k1 is None or k2 is None or k3 is None:
+            return None
+        return [complex(x - z, x + y) for x, y, z in zip(k1, k2, k3)]
+
+    a_scaled, b_scaled = integers(a), integers(b)
+    if a_scaled is None or b_scaled is None:
+        return None
+    (a_ints, a_scale, a_type), (b_ints, b_scale, b_type) = a_scaled, b_scaled
+
+    # Every product coefficient is less than the half of the base, in absolute value
+    a_max, b_max = max(abs(x) for x in a_ints), max(abs(x) for x in b_ints)
+    bound = max(a_max * b_max * min(len(a), len(b)), a_max, b_max)
+    width = (bound.bit_length() + 2 + 7) // 8
+    base_bits = 8 * width
+    half = 1 << (base_bits - 1)
+
+    product = pack(a_ints, width, half) * pack(b_ints, width, half)
+    digits = len(a) + len(b) - 1
+    product += int.from_bytes(half.to_bytes(width, 'little') * digits, 'little')
+    data = product.to_bytes(width * digits, 'little')
+    coeffs = [int.from_bytes(data[i:i + width], 'little') - half for i in range(0, len(data), width)]
+
+    scale = a_scale * b_scale
+    if float in (a_type, b_type):
+        return [x / scale for x in coeffs]
+    if Decimal in (a_type, b_type):
+        return [Decimal(x) / scale for x in coeffs]
+    if Fraction in (a_type, b_type):
+        return [Fraction(x, scale) for x in coeffs]
+    return coeffs
+
+
+def integers(coeffs):
+    """
+    Return the integers list, the common scale of real coefficients such that coeffs[i] == integers[i] / scale,
+    and the type the products should get back (int, Fraction, Decimal or float, the latter ones rounding the others),
+    or None if some coefficients aren't finite real numbers
+    """
+    ratios, kinds = [], set()
+    for x in coeffs:
+        if isinstance(x, Integral):
+            ratios.append((int(x), 1))
+        elif isinstance(x, Fraction) or isinstance(x, (float, Decimal)) and isfinite(x):
+            ratios.append(x.as_integer_ratio())
+            kinds.add(type(x))
+        else:
+            return None
+
+    scale = reduce(lambda a, b: a * b // gcd(a, b), (denominator for _, denominator in ratios), 1)
+    kind = next((x for x in (float, Decimal, Fraction) if x in kinds), int)
+    return [numerator * (scale // denominator) for numerator, denominator in ratios], scale, kind
+
+
+def pack(ints, width, half):
+    """Value of the polynomial at 2^(8·width), the coefficients being less than half in absolute value"""
+    offset = int.from_bytes(half.to_bytes(width, 'little') * len(ints), 'little')
+    return int.from_bytes(b''.join((x + half).to_bytes(width, 'little') for x in ints), 'little') - offset
+
+
+def sum_lists(a, b):
+    if len(a) < len(b):
+        a, b = b, a
+    return [x + y for x, y in zip(a, b)] + a[len(b):]
+
+
+def accumulate(target, source, offset, sign=1):
+    """Add sign·source to the target list from the given offset"""
+    end = offset + len(source)
+    if sign == 1:
+        target[offset:end] = map(add, target[offset:end], source)
+    else:
+        target[offset:end] = [x - y for x, y in zip(target[offset:end], source)]
@@ -0,0 +1,156 @@
+"""
+Dense univariate polynomials
+"""
+from decimal import Decimal, Overflow
+from fractions import Fraction
+from functools import reduce
+from itertools import accumulate, zip_longest
+from operator import mul
+
+from mathematics import is_integer, parse_number
+from mathematics.convolution import convolve
+from mathematics.exceptions import MathError
+from mathematics.numbers import Complex
+
+
+class Dense:
+    """
+    This class represents a polynomial of a single variable with natural degrees,
+    kept as the list of all its coefficients from degree 0 up to its degree.
+
+    For the 25 + 5x - x^2 polynomial there will be following data structure:
+
+    name: 'x'
+    coeffs: [25, 5, -1]
+
+    Constants have no name, the zero polynomial has no coefficients.
+    Coefficients are native python numbers (int, float or complex), so that integer coefficients stay exact,
+    or fractions and decimals with the other backends, complex coefficients of such parts being kept as Complex numbers.
+    """
+    __slots__ = ('name', 'coeffs')
+
+    def __init__(self, name, coeffs):
+        coeffs = list(coeffs)
+        while coeffs and coeffs[-1] == 0:
+            coeffs.pop()
+        self.name = name if len(coeffs) > 1 else None
+        self.coeffs = coeffs
+
+    @classmethod
+    def from_monomials(cls, names, monomials):
+        """Return the dense form of sparse monomials (see Polynomial), or None if it has no dense form"""
+        if len(names) > 1:
+            return None
+        if not names:
+            return cls(None, [native(coeff) for coeff in monomials.values()])
+
+        exponents = []
+        for (exponent,) in monomials:
+            if not is_integer(exponent) or exponent < 0:
+                return None
+            exponents.append(parse_number(exponent))
+
+        coeffs = [0] * (max(exponents, default=-1) + 1)
+        for exponent, coeff in zip(exponents, monomials.values()):
+            coeffs[exponent] = native(coeff)
+        return cls(names[0], coeffs)
+
+    @property
+    def names(self):
+        return (self.name,) if self.name is not None else ()
+
+    @property
+    def monomials(self):
+        if self.name is None:
+            return {(): number(coeff) for coeff in self.coeffs}
+        return {(degree,): number(coeff) for degree, coeff in enumerate(self.coeffs) if coeff != 0}
+
+    @property
+    def degree(self):
+        return max(len(self.coeffs) - 1, 0)
+
+    def joins(self, other):
+        """Check whether both polynomials have the same variable, constants join any polynomial"""
+        return self.name is None or other.name is None or self.name == other.name
+
+    # Math operations, see joins
+
+    def __add__(self, other):
+        return Dense(self.name or other.name,
+                     [a + b for a, b in zip_longest(self.coeffs, other.coeffs, fillvalue=0)])
+
+    def __sub__(self, other):
+        return Dense(self.name or other.name,
+                     [a - b for a, b in zip_longest(self.coeffs, other.coeffs, fillvalue=0)])
+
+    def __neg__(self):
+        return Dense(self.name, [-coeff for coeff in self.coeffs])
+
+    def __truediv__(self, divisor):
+        return Dense(self.name, [coeff / divisor for coeff in self.coeffs])
+
+    def __mul__(self, other):
+        """Product computed by the fastest algorithm for the degrees, see mathematics.convolution"""
+        if not self.coeffs or not other.coeffs:
+            return Dense(None, [])
+        return Dense(self.name or other.name, convolve(self.coeffs, other.coeffs))
+
+    def __pow__(self, power):
+        """Natural power, see expand, raising MathError when float or decimal coefficients overflow"""
+        try:
+            return self.expand(power)
+        except (OverflowError, Overflow):
+            raise MathError('Too big power')
+
+    def expand(self, power):
+        """
+        Natural power: monomials and binomials, e.g. (2x - 3)^n, are expanded by the binomial theorem,
+        other polynomials are raised by squaring. See the page https://en.wikipedia.org/wiki/Binomial_theorem
+        """
+        terms = [(degree, coeff) for degree, coeff in enumerate(self.coeffs) if coeff != 0]
+        if len(terms) == 1:
+            (degree, coeff), = terms
+            return Dense(self.name, [0] * (degree * power) + [coeff ** power])
+
+        if len(terms) == 2:
+            # (a·x^i + b·x^j)^n = sum of C(n, k)·a^(n - k)·b^k·x^(i·(n - k) + j·k) for k from 0 to n
+            (i, a), (j, b) = terms
+            a_powers = list(accumulate([a] * power, mul, initial=1))
+            b_powers = list(accumulate([b] * power, mul, initial=1))
+            coeffs = [0] * (j * power + 1)
+            binomial = 1
+            for k in range(power + 1):
+                coeffs[i * (power - k) + j * k] = binomial * a_powers[power - k] * b_powers[k]
+                binomial = binomial * (power - k) // (k + 1)
+            return Dense(self.name, coeffs)
+
+        result, square = Dense(None, [1]), self
+        while True:
+            if power & 1:
+                result = result * square
+            power >>= 1
+            if not power:
+                return result
+            square = square * square
+
+    def evaluate(self, value):
+        """Value of the polynomial at the given point using the Horner's method"""
+        return reduce(lambda result, coeff: result * value + coeff, reversed(self.coeffs), 0)
+
+
+def native(coeff):
+    """Convert a number to the python native number, unless it has fraction or decimal parts that complex would round"""
+    if isinstance(coeff, Complex):
+        if not coeff.imag:
+            return coeff.real
+        if isinstance(coeff.real, (Fraction, Decimal)) or isinstance(coeff.imag, (Fraction, Decimal)):
+            return coeff
+        return complex(coeff.real, coeff.imag)
+    return coeff
+
+
+def number(coeff):
+    """Convert a python native number to the home-made number type when needed"""
+    if isinstance(coeff, complex):
+        return Complex(real=coeff.real, imag=coeff.imag) if coeff.imag else parse_number(coeff.real)
+    return coeff
@@ -1,33 +1,42 @@
 """
 Home-made number data types
 """
+from decimal import Decimal, Overflow
+from fractions import Fraction
 from numbers import Number
-from mathematics import abs, is_integer, parse_number, bisection
+from mathematics import MAX_POWER_BITS, abs, format_number, is_integer, parse_number
 from mathematics.exceptions import MathError
+from mathematics.roots import complex_root
 
 
 class Complex(Number):
     """
     This class represents complex number data type.
     All other number types are its subclasses.
-    Its real and imaginary parts are stored as python native int or float numbers
+    Its real and imaginary parts are stored as python native int or float numbers, integral floats as ints,
+    or as fractions or decimals with the other backends (see mathematics.backends), which are kept as they are.
+    Numbers must not be changed once built, as the constants below are shared
     """
+    __slots__ = ('real', 'imag')
+
     def __init__(self, make_from=0, real=0, imag=0):
         if isinstance(make_from, Complex):
             self.real = make_from.real
             self.imag = make_from.imag
         else:
-            self.real = parse_number(make_from or real)
-            self.imag = parse_number(imag)
+            self.real = part(make_from or real)
+            self.imag = part(imag)
 
     def is_integer(self):
         return not self.imag and is_integer(self.real)
 
-    # Comparisons
+    # Comparisons, python native real numbers are compared directly
 
     def __eq__(self, other):
         if isinstance(other, Complex):
             return self.real == other.real and self.imag == other.imag
+        elif isinstance(other, NATIVE):
+            return not self.imag and self.real == other
         elif isinstance(other, Number):
             return self.__eq__(Complex(other))
         return NotImplemented
@@ -35,9 +44,15 @@ class Complex(Number):
     def __ne__(self, other):
         return not self.__eq__(other)
 
+    def __hash__(self):
+        # Equal to the hash of the equal python number
+        return hash(complex(self.real, self.imag)) if self.imag else hash(self.real)
+
     def __lt__(self, other):
         if isinstance(other, Complex):
             return self.real < other.real
+        elif isinstance(other, NATIVE):
+            return self.real < other
         elif isinstance(other, Number):
             return self.__lt__(Complex(other))
         return NotImplemented
@@ -45,6 +60,8 @@ class Complex(Number):
     def __le__(self, other):
         if isinstance(other, Complex):
             return self.real <= other.real
+        elif isinstance(other, NATIVE):
+            return self.real <= other
         elif isinstance(other, Number):
             return self.__le__(Complex(other))
         return NotImplemented
@@ -52,6 +69,8 @@ class Complex(Number):
     def __gt__(self, other):
         if isinstance(other, Complex):
             return self.real > other.real
+        elif isinstance(other, NATIVE):
+            return self.real > other
         elif isinstance(other, Number):
             return self.__gt__(Complex(other))
         return NotImplemented
@@ -59,15 +78,19 @@ class Complex(Number):
     def __ge__(self, other):
         if isinstance(other, Complex):
             return self.real >= other.real
+        elif isinstance(other, NATIVE):
+            return self.real >= other
         elif isinstance(other, Number):
             return self.__ge__(Complex(other))
         return NotImplemented
 
-    # Math operations (left- and right-hand)
+    # Math operations (left- and right-hand), with real-only fast paths
 
     def __add__(self, other):
         if isinstance(other, Complex):
-            return Complex(real=self.real + other.real, imag=self.imag + other.imag)
+            return make(self.real + other.real, self.imag + other.imag)
+        elif isinstance(other, NATIVE):
+            return make(self.real + other, self.imag)
         elif isinstance(other, Number):
             return self.__add__(Complex(other))
         return NotImplemented
@@ -77,20 +100,30 @@ class Complex(Number):
 
     def __sub__(self, other):
         if isinstance(other, Complex):
-            return Complex(real=self.real - other.real, imag=self.imag - other.imag)
+            return make(self.real - other.real, self.imag - other.imag)
+        elif isinstance(other, NATIVE):
+            return make(self.real - other, self.imag)
         elif isinstance(other, Number):
             return self.__sub__(Complex(other))
         return NotImplemented
 
     def __rsub__(self, other):
-        return other + self * -1
+        if isinstance(other, NATIVE):
+            return make(other - self.real, -self.imag)
+        elif isinstance(other, Number):
+            return Complex(other).__sub__(self)
+        return NotImplemented
 
     def __mul__(self, other):
         if isinstance(other, Complex):
-            return Complex(
-                real=self.real * other.real - self.imag * other.imag,
-                imag=self.real * other.imag + self.imag * other.real
+            if not self.imag and not other.imag:
+                return make(self.real * other.real)
+            return make(
+                self.real * other.real - self.imag * other.imag,
+                self.real * other.imag + self.imag * other.real
             )
+        elif isinstance(other, NATIVE):
+            return make(self.real * other, self.imag * other)
         elif isinstance(other, Number):
             return self.__mul__(Complex(other))
         return NotImplemented
@@ -100,55 +133,94 @@ class Complex(Number):
 
     def __truediv__(self, other):
         if isinstance(other, Complex):
-            return Complex(
-                real=(self.real * other.real + self.imag * other.imag) / (other.real ** 2 + other.imag ** 2),
-                imag=(self.imag * other.real - self.real * other.imag) / (other.real ** 2 + other.imag ** 2)
+            if not other.imag:
+                return self.__truediv__(other.real)
+            return make(
+                (self.real * other.real + self.imag * other.imag) / (other.real ** 2 + other.imag ** 2),
+                (self.imag * other.real - self.real * other.imag) / (other.real ** 2 + other.imag ** 2)
             )
+        elif isinstance(other, NATIVE):
+            return make(self.real / other, self.imag / other)
         elif isinstance(other, Number):
             return self.__truediv__(Complex(other))
         return NotImplemented
 
     def __rtruediv__(self, other):
         if isinstance(other, Complex):
-            return Complex(
-                real=(other.real * self.real + other.imag * self.imag) / (self.real ** 2 + self.imag ** 2),
-                imag=(other.imag * self.real - other.real * self.imag) / (self.real ** 2 + self.imag ** 2)
+            return other.__truediv__(self)
+        elif isinstance(other, NATIVE):
+            if not self.imag:
+                return make(other / self.real)
+            return make(
+                other * self.real / (self.real ** 2 + self.imag ** 2),
+                -other * self.imag / (self.real ** 2 + self.imag ** 2)
             )
         elif isinstance(other, Number):
             return self.__rtruediv__(Complex(other))
         return NotImplemented
 
     def __pow__(self, power, modulo=None):
-        if modulo:
-            return NotImplemented
+        if modulo is not None:
+            return self.modular_power(power, modulo)
 
         if self == 0 and power < 0:
             raise ZeroDivisionError('Trying to get a negative power of zero')
 
-        try:
-            if is_integer(power):
-                if power == 0:
-                    return Complex(1)
-                if power == 1:
-                    return Complex(real=self.real, imag=self.imag)
-                if power > 1:
-                    return self * self.__pow__(power - 1)
-                if power < 0:
-                    return Complex(1) / self.__pow__(-power)
-            elif power == 0.5 and not self.imag:
-                n = abs(self.real)
-
-                # We will use the bisection algorithm to find the roots
-                # of the x^2 - n = 0 equation on the interval from 0 to n
-                root = bisection(lambda x: x * x - n, 0, n)
-                return Complex(real=root) if self.real >= 0 else Complex(imag=root)
-        except RecursionError:
-            raise MathError('Too big power')
+        if is_integer(power):
+            power = parse_number(power)
+            check_power(self, power)
+            try:
+                if not self.imag:
+                    # Native python power, exact for integers and fractions
+                    return make(self.real ** power)
+                result = self.binary_power(abs(power))
+            except (OverflowError, Overflow):
+                raise MathError('Too big power')
+            return result if power >= 0 else ONE / result
+        elif power > 0 and is_integer(1 / power):
+            # Principal n-th root, see mathematics.roots
+            real, imag = complex_root(self.real, self.imag, parse_number(1 / power))
+            return make(real, imag)
 
         return NotImplemented
 
+    def binary_power(self, power, modulo=None):
+        """
+        Natural power by squaring, with parts reduced modulo an integer if given.
+        See the page https://en.wikipedia.org/wiki/Exponentiation_by_squaring
+        """
+        result, square = ONE, self
+        while power:
+            if power & 1:
+                result = result * square
+                if modulo is not None:
+                    result = make(result.real % modulo, result.imag % modulo)
+            power >>= 1
+            if power:
+                square = square * square
+                if modulo is not None:
+                    square = make(square.real % modulo, square.imag % modulo)
+        return result
+
+    def modular_power(self, power, modulo):
+        """Power modulo an integer, for integers and gaussian integers (i.e. with integer real and imaginary parts)"""
+        if not all(is_integer(x) for x in (self.real, self.imag, power, modulo)):
+            raise MathError("Modular powers are defined for integers only")
+        power, modulo = parse_number(power), parse_number(modulo)
+        if modulo == 0:
+            raise ZeroDivisionError('Trying to get a power modulo zero')
+
+        if not self.imag:
+            try:
+                return make(pow(self.real, power, modulo))
+            except ValueError:
+                raise MathError(f"{self} has no inverse modulo {modulo}")
+        if power < 0:
+            raise MathError("Negative modular powers are defined for real integers only")
+        return self.binary_power(power, modulo)
+
     def __neg__(self):
-        return self * -1
+        return make(-self.real, -self.imag)
 
     def __abs__(self):
         if self.imag:
@@ -157,9 +229,17 @@ class Complex(Number):
 
     # String representation
 
+    def __repr__(self):
+        return f"{type(self).__name__}(real={self.real!r}, imag={self.imag!r})"
+
+    def __format__(self, format_spec):
+        if format_spec and not self.imag:
+            return format_number(self.real, format_spec)
+        return format(str(self), format_spec)
+
     def __str__(self):
-        real = f"{self.real:g}"
-        imag = f"{abs(self.imag):g}" if abs(self.imag) != 1 else ""
+        real = format_number(self.real)
+        imag = format_number(abs(self.imag)) if abs(self.imag) != 1 else ""
         sign = '+' if self.imag > 0 else '-'
 
         if not self.imag:
@@ -171,17 +251,58 @@ class Complex(Number):
 
 
 class Real(Complex):
-    pass
+    __slots__ = ()
 
 
 class Rational(Real):
-    pass
+    __slots__ = ()
 
 
 class Integral(Rational):
-    pass
+    __slots__ = ()
 
 
 class AnyRealNumber(Real):
-    pass
+    __slots__ = ()
+
+
+# Python real numbers, operands of the fast paths
+NATIVE = (int, float, Fraction, Decimal)
+
+
+def make(real, imag=0):
+    """
+    Build a Complex from python native parts directly, without the parse_number conversions:
+    only integral floats need to become ints
+    """
+    number = object.__new__(Complex)
+    number.real = int(real) if real.__class__ is float and real.is_integer() else real
+    number.imag = int(imag) if imag.__class__ is float and imag.is_integer() else imag
+    return number
+
+
+def part(n):
+    """Convert a real or imaginary part given to Complex, fractions and decimals are kept even when integral"""
+    return n if isinstance(n, (Fraction, Decimal)) else parse_number(n)
+
+
+def bits(n):
+    """Size of an integer or a fraction in bits"""
+    return max(n.numerator.bit_length(), n.denominator.bit_length())
+
+
+def check_power(x, power):
+    """
+    Raise MathError if the integer power of a number would have too big exact parts: integers and fractions grow
+    by their size in bits for each unit of the power, up to MAX_POWER_BITS, gaussian integers included
+    """
+    size = max(bits(part) if isinstance(part, (int, Fraction)) else 0 for part in (x.real, x.imag))
+    if size * abs(power) > MAX_POWER_BITS:
+        raise MathError('Too big power')
+
+
+ZERO = make(0)
+ONE = make(1)
+MINUS_ONE = make(-1)
+I = make(0, 1)
 
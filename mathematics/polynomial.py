@@ -1,58 +1,175 @@
+from array import array
 from collections import namedtuple
-from functools import reduce
-from itertools import groupby
+from functools import cached_property, reduce
+from itertools import accumulate, groupby
+from math import comb, fabs, nan, sqrt
 from numbers import Number
+from operator import add, mul, sub
 
-from mathematics import abs, is_integer
+from mathematics import MAX_TERMS, MULTINOMIAL_TERMS, abs, format_number, is_integer, parse_number
+from mathematics.backends import active
+from mathematics.dense import Dense, native, number
 from mathematics.exceptions import MathError
-from mathematics.numbers import AnyRealNumber, Complex
+from mathematics.numbers import ONE, ZERO, AnyRealNumber, Complex, check_power, make
+from mathematics.rational import exact_roots, rational
+from mathematics.solvers import order, solve
+from mathematics.sturm import Sturm
 from parser.exceptions import ResolveError
 
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
 
 class Polynomial:
     """
     This class represents a polynomial expression.
 
-    For the 25 + 3x + 2x - x^2 polynomial there will be following data structure:
+    For the 25 + 3x + 2x - x^2 * y polynomial there will be following data structure:
 
-    terms: [
-        Term(25, []),
-        Term(3, [Variable('x', 1)]),
-        Term(2, [Variable('x', 1)]),
-        Term(-1, [Variable('x', 2)]),
-    ]
-    terms_reduced: [
+    names: ('x', 'y')
+    monomials: {
+        (0, 0): 25,
+        (1, 0): 5,
+        (2, 1): -1,
+    }
+    terms_reduced: (
         Term(25, []),
         Term(5, [Variable('x', 1)]),
-        Term(-1, [Variable('x', 2)]),
-    ]
+        Term(-1, [Variable('x', 2), Variable('y', 1)]),
+    )
     degree: 2
-    variables: ['x']
+    variables: ['x', 'y']
+
+    The polynomial is kept sparse and reduced: monomials maps the exponents of each monomial,
+    indexed like the sorted variable names, to its non-zero coefficient.
+    Every operation combines equal monomials right away, so the cost of operations and the memory used
+    depend on the number of distinct monomials only. Terms are a read-only view of the monomials.
+
+    non_zero holds the variables that have been used with negative powers, see variables_non_zero.
+
+    Polynomials of a single variable with natural degrees, i.e. most of equations, also have a dense form
+    (see mathematics.dense.Dense), used by operations between such polynomials.
+    A polynomial may be built from either form, the other one is computed on demand.
+
+    Polynomials are immutable: the reduced form and everything derived from it are computed once, on first use.
+    Polynomials having the same reduced form are equal and have the same hash, so they may be used as keys.
     """
 
-    def __init__(self, make_from=None, terms=None):
+    def __init__(self, make_from=None, terms=None, names=(), monomials=None, dense=None, non_zero=frozenset()):
         if make_from is not None:
             if isinstance(make_from, Polynomial):
-                self.terms = make_from.terms
+                self.__dict__.update(make_from.__dict__)
+                return
             elif isinstance(make_from, Variable):
-                self.terms = [Term(coeff=1, variables=[make_from])]
+                terms = (Term(coeff=1, variables=[make_from]),)
             elif isinstance(make_from, Number):
-                self.terms = [Term(coeff=make_from, variables=[])]
+                terms = (Term(coeff=make_from, variables=[]),)
             else:
                 raise TypeError(f"Cannot build a polynomial object from {make_from}")
-        elif terms:
-            self.terms = terms
-        else:
+        elif monomials is None and dense is None and not terms:
             raise TypeError("Could not build a polynomial object")
 
-    @property
+        if dense is not None:
+            self.__dict__.update(dense=dense, non_zero=frozenset(non_zero))
+            return
+
+        if monomials is None:
+            names, monomials, negative = self.collect(terms)
+            non_zero = negative | non_zero
+
+        self.__dict__.update(names=tuple(names), monomials=monomials, non_zero=frozenset(non_zero))
+
+    @cached_property
+    def dense(self):
+        """The dense form, None if the polynomial has several variables or degrees that are not natural"""
+        return Dense.from_monomials(self.names, self.monomials)
+
+    @cached_property
+    def names(self):
+        return self.dense.names
+
+    @cached_property
+    def monomials(self):
+        return self.dense.monomials
+
+    def joined(self, other):
+        """Return the dense forms of both polynomials if they may be computed together, see Dense.joins"""
+        if self.dense is not None and other.dense is not None and self.dense.joins(other.dense):
+            return self.dense, other.dense
+        return None
+
+    @staticmethod
+    def collect(terms):
+        """Return the names, the monomials and the variables used with negative powers of a list of terms"""
+        names = tuple(sorted({x.name for term in terms for x in term.variables if x.degree != 0}))
+        indexes = {name: index for index, name in enumerate(names)}
+        monomials = {}
+
+        for term in terms:
+            exponents = [0] * len(names)
+            for variable in term.variables:
+                if variable.degree != 0:
+                    exponents[indexes[variable.name]] += variable.degree
+            add_monomial(monomials, tuple(exponents), term.coeff)
+
+        negative = frozenset(x.name for term in terms for x in term.variables if x.degree < 0)
+        return names, monomials, negative
+
+    def aligned(self, other):
+        """Return the common names of both polynomials and their monomials indexed like these names"""
+        if self.names == other.names:
+            return self.names, self.monomials, other.monomials
+
+        names = tuple(sorted(set(self.names) | set(other.names)))
+        return names, self.expanded(names), other.expanded(names)
+
+    def expanded(self, names):
+        """Return the monomials indexed like the given names, a superset of self.names"""
+        if names == self.names:
+            return self.monomials
+
+        positions = [names.index(name) for name in self.names]
+        monomials = {}
+        for key, coeff in self.monomials.items():
+            exponents = [0] * len(names)
+            for position, exponent in zip(positions, key):
+                exponents[position] = exponent
+            monomials[tuple(exponents)] = coeff
+        return monomials
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"Polynomial objects are immutable, cannot set {name}")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"Polynomial objects are immutable, cannot delete {name}")
+
+    @cached_property
+    def terms(self):
+        return tuple(
+            Term(coeff=coeff, variables=[
+                Variable(name=name, degree=exponent) for name, exponent in zip(self.names, key) if exponent != 0
+            ])
+            for key, coeff in self.monomials.items()
+        ) or (Term(coeff=0, variables=[]),)
+
+    @cached_property
     def terms_reduced(self):
-        sorted_terms = sorted((x for x in self.terms if x.coeff != 0), key=lambda x: x.variables_reduced)
-        reduced_terms = [
-            Term(coeff=reduce(lambda a, x: a + x.coeff, list(group), 0), variables=key)
-            for key, group in groupby(iterable=sorted_terms, key=lambda x: x.variables_reduced)
-        ]
-        return [x for x in reduced_terms if x.coeff != 0]
+        return tuple(sorted((x for x in self.terms if x.coeff != 0), key=lambda x: x.variables))
+
+    @cached_property
+    def canonical(self):
+        """Hashable reduced form: (coeff, (Variable, ...)) pairs"""
+        return tuple((term.coeff, tuple(term.variables)) for term in self.terms_reduced)
+
+    def __eq__(self, other):
+        if isinstance(other, Polynomial):
+            return self.canonical == other.canonical
+        return NotImplemented
+
+    def __hash__(self):
+        return hash(self.canonical)
 
     def get_term(self, degree):
         try:
@@ -63,39 +180,47 @@ class Polynomial:
         except StopIteration:
             return Term(coeff=0, variables=[])
 
-    @property
+    @cached_property
     def degree(self):
         return max([term.degree for term in self.terms_reduced], default=0)
 
-    @property
+    @cached_property
     def variables(self):
         return list(set(variable.name
                         for term in self.terms_reduced
                         for variable in term.variables))
 
-    @property
+    @cached_property
     def variables_non_zero(self):
         """Variables have been used with negative powers, so they can not be equal to zero"""
-        return list(set(variable.name
-                        for term in self.terms
-                        for variable in term.variables
-                        if variable.degree < 0))
+        return sorted(self.non_zero)
 
     # Roots finding
 
-    @property
+    @cached_property
+    def coefficients(self):
+        """
+        Coefficients of a polynomial of a single variable with natural degrees as Complex numbers,
+        from degree 0 up to its degree, collected once for all the roots finding, see mathematics.solvers
+        """
+        coefficients = [ZERO] * (parse_number(self.degree) + 1)
+        for term in self.terms_reduced:
+            coefficients[parse_number(term.degree)] += term.coeff
+        return coefficients
+
+    @cached_property
     def a(self):
-        return Complex(self.get_term(degree=2).coeff)
+        return self.coefficients[2]
 
-    @property
+    @cached_property
     def b(self):
-        return Complex(self.get_term(degree=1).coeff)
+        return self.coefficients[1]
 
-    @property
+    @cached_property
     def c(self):
-        return Complex(self.get_term(degree=0).coeff)
+        return self.coefficients[0]
 
-    @property
+    @cached_property
     def D(self):
         return Complex(self.b ** 2 - 4 * self.a * self.c)
 
@@ -113,74 +238,189 @@ class Polynomial:
             return -self.c / self.b
 
         if self.degree == 2:
+            root = self.D ** 0.5
             return (
-                (-self.b + self.D ** 0.5) / (2 * self.a),
-                (-self.b - self.D ** 0.5) / (2 * self.a),
+                (-self.b + root) / (2 * self.a),
+                (-self.b - root) / (2 * self.a),
             )
 
         if self.degree > 2:
-            raise ResolveError("The polynomial degree is strictly greater than 2, I can't solve.")
+            # Rational roots and repeated factors are found exactly, the factors left are solved numerically
+            coeffs = rational(self.coefficients)
+            if coeffs is None:
+                roots = solve(self.coefficients)
+            else:
+                exact, factors = exact_roots(coeffs)
+                backend = active()
+                roots = [make(backend.rational(x)) for x in exact]
+                for factor, multiplicity in factors:
+                    roots += solve([make(backend.rational(x)) for x in factor]) * multiplicity
+            return tuple(sorted(roots, key=order))
 
         raise ResolveError(f"Cannot solve polynomials of degree {self.degree}")
 
+    @cached_property
+    def sturm(self):
+        """
+        Sturm chain of a polynomial of a single variable with natural degrees and real coefficients, built once
+        for all the counting, isolation and refinement of its real roots, see mathematics.sturm
+        """
+        if len(self.variables) > 1:
+            raise ResolveError("Cannot count the real roots of polynomials with multiple variables")
+        if any(x.has_unsupported_degrees for x in self.terms_reduced):
+            raise ResolveError("Cannot count the real roots of polynomials with non-natural degrees")
+        if self.degree == 0:
+            raise ResolveError("Cannot count the real roots of constant polynomials")
+        if any(x.imag for x in self.coefficients):
+            raise ResolveError("Cannot count the real roots of polynomials with complex coefficients")
+        return Sturm([x.real for x in self.coefficients])
+
+    def count_real_roots(self, a=None, b=None):
+        """Number of distinct real roots in the (a, b] interval, None for infinite endpoints"""
+        return self.sturm.count(a, b)
+
+    def isolate_real_roots(self, a=None, b=None):
+        """Sorted (lo, hi] intervals with fraction endpoints, each with one distinct real root in (a, b]"""
+        return tuple(self.sturm.isolate(a, b))
+
+    def real_roots(self, a=None, b=None, precision=None):
+        """Sorted distinct real roots in (a, b], refined to the precision (the backend error by default)"""
+        return tuple(self.sturm.roots(a, b, precision))
+
     # Math operations (left- and right-hand)
 
     def __add__(self, other):
-        return Polynomial(terms=self.terms + Polynomial(other).terms)
+        other = Polynomial(other)
+        joined = self.joined(other)
+        if joined is not None:
+            return Polynomial(dense=joined[0] + joined[1], non_zero=self.non_zero | other.non_zero)
+
+        names, monomials, others = self.aligned(other)
+        monomials = dict(monomials)
+        for key, coeff in others.items():
+            add_monomial(monomials, key, coeff)
+        return Polynomial(names=names, monomials=monomials, non_zero=self.non_zero | other.non_zero)
 
     def __radd__(self, other):
         return self + other
 
+    def __neg__(self):
+        if self.dense is not None:
+            return Polynomial(dense=-self.dense, non_zero=self.non_zero)
+        return Polynomial(
+            names=self.names, monomials={key: -coeff for key, coeff in self.monomials.items()}, non_zero=self.non_zero
+        )
+
     def __sub__(self, other):
-        return self + Polynomial(other) * -1
+        return self + -Polynomial(other)
 
     def __rsub__(self, other):
-        return Polynomial(other) + self * -1
+        return Polynomial(other) + -self
 
     def __mul__(self, other):
         try:
-            return Polynomial(terms=[
-                a_term * b_term
-                for a_term in self.terms
-                for b_term in Polynomial(other).terms
-            ])
-        except:
+            other = Polynomial(other)
+        except TypeError:
             return NotImplemented
 
+        return self.multiply(other)
+
+    def multiply(self, other, max_terms=MAX_TERMS):
+        """
+        Return the product of both polynomials, raising MathError rather than
+        building a product of more than max_terms distinct terms
+        """
+        joined = self.joined(other)
+        if joined is not None:
+            if joined[0].degree + joined[1].degree >= max_terms:
+                raise MathError(f"Too many terms, the result would have more than {max_terms}")
+            return Polynomial(dense=joined[0] * joined[1], non_zero=self.non_zero | other.non_zero)
+
+        names, monomials, others = self.aligned(other)
+        product = {}
+        others = others.items()
+        for a_key, a_coeff in monomials.items():
+            # Accumulate first, zero coefficients are dropped once at the end
+            for b_key, b_coeff in others:
+                key = tuple(map(add, a_key, b_key))
+                product[key] = product[key] + a_coeff * b_coeff if key in product else a_coeff * b_coeff
+            if len(product) > max_terms:
+                raise MathError(f"Too many terms, the result would have more than {max_terms}")
+
+        product = {key: coeff for key, coeff in product.items() if coeff != 0}
+        return Polynomial(names=names, monomials=product, non_zero=self.non_zero | other.non_zero)
+
     def __rmul__(self, other):
         return self * other
 
     def __truediv__(self, other):
         if isinstance(other, Number):
-            return Polynomial(terms=[
-                Term(coeff=coeff / other, variables=variables) for coeff, variables in self.terms
-            ])
+            if self.dense is not None:
+                return Polynomial(dense=self.dense / native(other), non_zero=self.non_zero)
+            return Polynomial(
+                names=self.names,
+                monomials={key: coeff / other for key, coeff in self.monomials.items()},
+                non_zero=self.non_zero,
+            )
         elif isinstance(other, Polynomial):
-            if not other.terms_reduced:
+            if not other.monomials:
                 raise ZeroDivisionError()
-            if len(other.terms_reduced) > 1:
+            if len(other.monomials) > 1:
                 raise MathError('Cannot divide by a polynomial with multiple terms')
 
-            return Polynomial(terms=[term / other.terms[0] for term in self.terms])
+            names, monomials, others = self.aligned(other)
+            (divisor_key, divisor_coeff), = others.items()
+            quotient = {}
+            for key, coeff in monomials.items():
+                add_monomial(quotient, tuple(map(sub, key, divisor_key)), coeff / divisor_coeff)
+            # Variables of the divisor get negative powers
+            divisor = {name for name, exponent in zip(names, divisor_key) if exponent > 0}
+            return Polynomial(names=names, monomials=quotient, non_zero=self.non_zero | other.non_zero | divisor)
         else:
             return self.__truediv__(Polynomial(other))
 
     def __pow__(self, power, modulo=None):
-        try:
-            if is_integer(power):
-                if power == 0:
-                    return Complex(1)
-                if power == 1:
-                    return self
-                if power > 1:
-                    return self * self.__pow__(power - 1)
-        except RecursionError:
-            raise MathError('Too big power')
-
+        if is_integer(power) and power >= 0:
+            return self.power(parse_number(power))
         return NotImplemented
 
+    def power(self, power, max_terms=MAX_TERMS):
+        """
+        Return the polynomial raised to a natural power, raising MathError rather than
+        building a result of more than max_terms distinct terms, or coefficients too big (see check_power).
+        The power is computed:
+        - for dense polynomials, see Dense.__pow__
+        - for sparse polynomials of a few terms, by the multinomial expansion
+        - for other polynomials, by squaring, see multiply
+        """
+        if power == 0:
+            return ONE
+        for coeff in self.dense.coeffs if self.dense is not None else self.monomials.values():
+            check_power(coeff, power)
+
+        if self.dense is not None:
+            if self.dense.degree * power >= max_terms:
+                raise MathError(f"Too many terms, the result would have more than {max_terms}")
+            return Polynomial(dense=self.dense ** power, non_zero=self.non_zero)
+
+        size = len(self.monomials)
+        if size <= MULTINOMIAL_TERMS and comb(power + size - 1, size - 1) <= max_terms:
+            return Polynomial(names=self.names, monomials=multinomial(self.monomials, power), non_zero=self.non_zero)
+
+        result, square = None, self
+        while True:
+            if power & 1:
+                result = square if result is None else result.multiply(square, max_terms)
+            power >>= 1
+            if not power:
+                return result
+            square = square.multiply(square, max_terms)
+
     # String representation
 
+    def __repr__(self):
+        return f"Polynomial(terms={self.terms_reduced!r}, non_zero={frozenset(self.variables_non_zero)!r})"
+
     def __str__(self):
         chunks = []
         for index, term in enumerate(self.terms_reduced):
@@ -189,7 +429,7 @@ class Polynomial:
                 coeff = [f'({term.coeff})']
             else:
                 sign = '-' if not Complex(term.coeff).imag and term.coeff < 0 else '+' if index else ''
-                coeff = [] if abs(term.coeff) == 1 and term.variables_reduced else [f'{abs(term.coeff):g}']
+                coeff = [] if abs(term.coeff) == 1 and term.variables_reduced else [format_number(abs(term.coeff))]
 
             variables = ' * '.join(coeff + [f'{variable}' for variable in term.variables_reduced])
 
@@ -197,7 +437,7 @@ class Polynomial:
 
         return ' '.join(chunks) or '0'
 
-    @property
+    @cached_property
     def solution_text(self):
         try:
             if self.degree == 2:
@@ -209,6 +449,9 @@ class Polynomial:
                 else:
                     solution = f"Discriminant is strictly negative, the two solutions are:\n{x1}\n{x2}"
 
+            elif self.degree > 2:
+                solution = "The solutions are:\n" + '\n'.join(f"{x}" for x in self.resolve())
+
             elif self.degree == 0:
                 if isinstance(self.resolve(), AnyRealNumber):
                     solution = "All real numbers are solutions"
@@ -226,6 +469,118 @@ class Polynomial:
         return f"Reduced form: {self} = 0\nPolynomial degree: {self.degree}\n{solution}"
 
 
+def multinomial(monomials, power):
+    """
+    Return the monomials of a polynomial of a few monomials raised to a natural power,
+    i.e. the sum of multinomial(power; k1, ..., km) * (c1 * m1)^k1 * ... * (cm * mm)^km for k1 + ... + km = power
+    See the page https://en.wikipedia.org/wiki/Multinomial_theorem
+    """
+    keys = list(monomials)
+    # Powers of the coefficient of each monomial, from 0 to power
+    powers = [list(accumulate([native(coeff)] * power, mul, initial=1)) for coeff in monomials.values()]
+    result = {}
+
+    for degrees in compositions(power, len(keys)):
+        coeff, remaining = 1, power
+        for index, degree in enumerate(degrees):
+            coeff *= comb(remaining, degree) * powers[index][degree]
+            remaining -= degree
+        exponents = tuple(sum(degree * key[i] for degree, key in zip(degrees, keys)) for i in range(len(keys[0])))
+        add_monomial(result, exponents, number(coeff))
+    return result
+
+
+def compositions(total, parts):
+    """Generate the tuples of parts natural numbers summing up to total"""
+    if parts == 1:
+        yield (total,)
+        return
+    for first in range(total, -1, -1):
+        for rest in compositions(total - first, parts - 1):
+            yield (first,) + rest
+
+
+def add_monomial(monomials, key, coeff):
+    """Add the coeff to the monomial of the given exponents key, keeping only non-zero coefficients"""
+    if key in monomials:
+        coeff = monomials[key] + coeff
+    if coeff != 0:
+        monomials[key] = coeff
+    else:
+        monomials.pop(key, None)
+
+
+class Quadratics(namedtuple('Quadratics', ['discriminants', 'x1', 'x2'])):
+    """
+    This class represents the solutions of many a·x^2 + b·x + c = 0 equations, see solve_quadratics.
+
+    For the equations with (a, b, c) = (1, -3, 2), (1, 2, 1) and (1, 0, 1) there will be following data structure:
+
+    discriminants: [1.0, 0.0, -4.0]
+    x1: [2+0j, -1+0j, 1j], (-b + √D) / 2a as in Polynomial.solution_text
+    x2: [1+0j, -1+0j, -1j], (-b - √D) / 2a, the same root as x1 if the discriminant is zero
+
+    Arrays are numpy arrays when numpy is installed, a float array.array and lists of complex numbers otherwise.
+    Equations with a = 0 are linear, both roots are -c / b then, nan if b = 0 too.
+    """
+
+
+def solve_quadratics(a, b, c):
+    """
+    Discriminants and both roots of the a·x^2 + b·x + c = 0 equations given as columns of real coefficients
+    (numpy arrays, array.array or any sequence), vectorized with numpy when it is installed.
+
+    Real roots are computed without cancellation: q = -(b + sign(b)·√D) / 2, the roots are q / a and c / q,
+    complex roots are -b / 2a ± i·√-D / 2a.
+    See the page https://en.wikipedia.org/wiki/Quadratic_equation#Numerical_calculation
+    """
+    if numpy is None:
+        solutions = [solve_quadratic(*coeffs) for coeffs in zip(a, b, c)]
+        return Quadratics(array('d', [x[0] for x in solutions]), [x[1] for x in solutions], [x[2] for x in solutions])
+
+    a, b, c = (numpy.asarray(x, dtype=float) for x in (a, b, c))
+    discriminants = b * b - 4 * a * c
+    root = numpy.sqrt(numpy.abs(discriminants))
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        q = -(b + numpy.where(b >= 0, root, -root)) / 2
+        big, small = q / a, numpy.where(q != 0, c / q, 0)
+        x1 = numpy.where(b >= 0, small, big).astype(complex)
+        x2 = numpy.where(b >= 0, big, small).astype(complex)
+
+        # + 0 turns the real part -0 into 0
+        double = -b / (2 * a) + 0
+        x1 = numpy.where(discriminants == 0, double, x1)
+        x2 = numpy.where(discriminants == 0, double, x2)
+        imag = root / (2 * a)
+        x1 = numpy.where(discriminants < 0, double + 1j * imag, x1)
+        x2 = numpy.where(discriminants < 0, double - 1j * imag, x2)
+
+        linear = numpy.where(b != 0, -c / b, numpy.nan)
+        x1 = numpy.where(a == 0, linear, x1)
+        x2 = numpy.where(a == 0, linear, x2)
+    return Quadratics(discriminants, x1, x2)
+
+
+def solve_quadratic(a, b, c):
+    """Discriminant and both roots of a single a·x^2 + b·x + c = 0 equation, see solve_quadratics"""
+    a, b, c = float(a), float(b), float(c)
+    discriminant = b * b - 4 * a * c
+    if a == 0:
+        x = complex(-c / b) if b != 0 else complex(nan)
+        return discriminant, x, x
+    if discriminant == 0:
+        x = complex(-b / (2 * a))
+        return discriminant, x, x
+    root = sqrt(fabs(discriminant))
+    if discriminant < 0:
+        real, imag = -b / (2 * a) + 0, root / (2 * a)
+        return discriminant, complex(real, imag), complex(real, -imag)
+
+    q = -(b + root) / 2 if b >= 0 else -(b - root) / 2
+    big, small = complex(q / a), complex(c / q)
+    return (discriminant, small, big) if b >= 0 else (discriminant, big, small)
+
+
 class Term(namedtuple('Term', ['coeff', 'variables'])):
     """
     This class represents a term of polynomial.
@@ -246,7 +601,7 @@ class Term(namedtuple('Term', ['coeff', 'variables'])):
     degree: 7
     """
 
-    @property
+    @cached_property
     def degree(self):
         if self.coeff == 0:
             return 0
@@ -0,0 +1,310 @@
+"""
+Exact roots of univariate polynomials with rational coefficients, given as lists of coefficients from degree 0:
+square-free factorization and rational roots, leaving only the factors without rational roots to numeric solvers
+"""
+from decimal import Decimal
+from fractions import Fraction
+from functools import reduce
+from itertools import product
+from math import gcd, isqrt
+
+from mathematics import MAX_RATIONAL_CANDIDATES
+from mathematics.roots import iroot
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Prime modulus of the square-free check, see is_square_free
+MODULUS = (1 << 31) - 1
+
+# Primes tried before Pollard's rho when factoring integers
+SMALL_PRIMES = [n for n in range(2, 1000) if all(n % d for d in range(2, isqrt(n) + 1))]
+
+# Pollard's rho iterations after which a factor is given up, its divisors are then missing
+RHO_ITERATIONS = 1 << 16
+
+
+def rational(coeffs):
+    """The real parts of Complex coefficients if they are all rational numbers, i.e. integers, fractions or decimals"""
+    if all(not x.imag and isinstance(x.real, (int, Fraction, Decimal)) for x in coeffs):
+        return [x.real for x in coeffs]
+    return None
+
+
+def exact_roots(coeffs):
+    """
+    Exact roots of a polynomial given as its rational coefficients from degree 0, with their multiplicities,
+    and the factors left without rational roots as (integer coefficients, multiplicity) pairs, e.g. for
+    (x - 2)^2·(x^3 - 1) the roots [2, 2, 1] and the factors [([1, 1, 1], 1)], i.e. x^2 + x + 1
+    """
+    coeffs = integers(coeffs)
+    zeros = next(index for index, x in enumerate(coeffs) if x)
+    roots, factors = [0] * zeros, []
+    for factor, multiplicity in square_free(coeffs[zeros:]):
+        found, factor = rational_roots(factor)
+        roots += found * multiplicity
+        if len(factor) > 1:
+            factors.append((factor, multiplicity))
+    return roots, factors
+
+
+def integers(coeffs):
+    """Primitive integer coefficients of the polynomial: scaled by the denominators, divided by their gcd"""
+    coeffs = [Fraction(x) for x in coeffs]
+    scale = reduce(lambda a, b: a * b // gcd(a, b), (x.denominator for x in coeffs), 1)
+    coeffs = [int(x * scale) for x in coeffs]
+    content = reduce(gcd, coeffs, 0)
+    sign = -1 if coeffs[-1] < 0 else 1
+    return [x // content * sign for x in coeffs]
+
+
+def square_free(coeffs):
+    """
+    Square-free factorization of a polynomial with integer coefficients and a non-zero constant: the list of
+    (factor, multiplicity) pairs whose factors have simple roots only, by the Yun's algorithm.
+    See the page https://en.wikipedia.org/wiki/Square-free_polynomial#Yun's_algorithm
+    """
+    if len(coeffs) <= 2 or is_square_free(coeffs):
+        return [(coeffs, 1)]
+
+    derivative = differentiate(coeffs)
+    a = polynomial_gcd(coeffs, derivative)
+    b, c = divide(coeffs, a), divide(derivative, a)
+    factors, multiplicity = [], 1
+    while len(b) > 1:
+        d = subtract(c, differentiate(b))
+        a = polynomial_gcd(b, d)
+        if len(a) > 1:
+            factors.append((a, multiplicity))
+        b, c = divide(b, a), divide(d, a)
+        multiplicity += 1
+    return factors
+
+
+def is_square_free(coeffs):
+    """
+    Check quickly whether a polynomial with integer coefficients has no repeated roots: p and p' have no common factor
+    modulo a prime that does not divide the leading coefficient, then none over rationals either.
+    A common factor modulo the prime may be a coincidence, in which case the factorization just finds no square
+    """
+    if not coeffs[-1] % MODULUS:
+        return False
+    a = [x % MODULUS for x in coeffs]
+    b = [degree * x % MODULUS for degree, x in enumerate(coeffs)][1:]
+    if numpy is not None:
+        a, b = numpy.array(a, dtype=numpy.int64), numpy.array(b, dtype=numpy.int64)
+    while len(b):
+        a, b = b, modular_remainder(a, b)
+    return len(a) == 1
+
+
+def modular_remainder(a, b):
+    """
+    Remainder of the polynomial division of a by b modulo MODULUS, without leading zeros.
+    Vectorized on numpy arrays of 64 bits integers when numpy is installed, products of residues fitting in them
+    """
+    a = a.copy()
+    size, inverse = len(b), pow(int(b[-1]), -1, MODULUS)
+    top = len(a) - 1
+    while top >= size - 1:
+        factor = int(a[top]) * inverse % MODULUS
+        if factor:
+            low = top - size + 1
+            if numpy is not None:
+                a[low:top] = (a[low:top] - factor * b[:-1]) % MODULUS
+            else:
+                a[low:top] = [(x - factor * y) % MODULUS for x, y in zip(a[low:top], b)]
+        top -= 1
+        while top >= 0 and not a[top]:
+            top -= 1
+    return a[:top + 1]
+
+
+def rational_roots(coeffs):
+    """
+    Rational roots of a square-free polynomial with integer coefficients and a non-zero constant,
+    and the integer coefficients of its quotient by all of them.
+    By the rational root theorem, a root p/q in lowest terms has p dividing the constant and q the leading coefficient,
+    and p - q divides f(1), p + q divides f(-1). Candidates are divided out by synthetic division by (q·x - p).
+    See the page https://en.wikipedia.org/wiki/Rational_root_theorem
+    """
+    if len(coeffs) == 1:
+        return [], coeffs
+    # Fujiwara's bound on the roots modulus: 2·max |a(n - k) / a(n)|^(1/k), integer roots rounded up
+    lead, degree = coeffs[-1], len(coeffs) - 1
+    bound = 2 * max(iroot(-(-abs(x) // lead), degree - k) + 1 for k, x in enumerate(coeffs[:-1]))
+    denominators = divisors(lead)
+    numerators = divisors(abs(coeffs[0]), bound * lead)
+    if len(numerators) * len(denominators) > MAX_RATIONAL_CANDIDATES:
+        return [], coeffs
+
+    at_one, at_minus_one = sum(coeffs), sum(x if degree % 2 == 0 else -x for degree, x in enumerate(coeffs))
+    roots = []
+    for numerator, q in product(numerators, denominators):
+        if numerator > bound * q or gcd(numerator, q) != 1:
+            continue
+        for p in (numerator, -numerator):
+            if p != q and at_one % (q - p) or p != -q and at_minus_one % (q + p):
+                continue
+            quotient = synthetic_division(coeffs, p, q)
+            if quotient is not None:
+                roots.append(Fraction(p, q))
+                coeffs = quotient
+        if len(coeffs) == 1:
+            break
+    return sorted(roots), coeffs
+
+
+def synthetic_division(coeffs, p, q):
+    """Integer coefficients of the quotient of the polynomial by (q·x - p), or None if it does not divide it"""
+    quotient = [0] * (len(coeffs) - 1)
+    carry = 0
+    for degree in range(len(coeffs) - 1, 0, -1):
+        carry, remainder = divmod(coeffs[degree] + p * carry, q)
+        if remainder:
+            return None
+        quotient[degree - 1] = carry
+    return quotient if coeffs[0] + p * carry == 0 else None
+
+
+def divisors(n, limit=None):
+    """Sorted positive divisors of a positive integer up to the limit if any, from its prime factorization"""
+    result = [1]
+    for prime, exponent in factorize(n).items():
+        result = [x * prime ** k for x in result for k in range(exponent + 1)
+                  if limit is None or x * prime ** k <= limit]
+    return sorted(result)
+
+
+def factorize(n):
+    """
+    Prime factorization of a positive integer as a {prime: exponent} dict: trial division by small primes,
+    then Pollard's rho for the big factors. A factor that cannot be split quickly is kept as if it was a prime
+    """
+    factors = {}
+    for prime in SMALL_PRIMES:
+        if prime * prime > n:
+            break
+        while n % prime == 0:
+            factors[prime] = factors.get(prime, 0) + 1
+            n //= prime
+
+    stack = [n] if n > 1 else []
+    while stack:
+        n = stack.pop()
+        factor = None if is_probable_prime(n) else pollard_rho(n)
+        if factor is None:
+            factors[n] = factors.get(n, 0) + 1
+        else:
+            stack += [factor, n // factor]
+    return factors
+
+
+def is_probable_prime(n):
+    """Miller-Rabin primality test, deterministic below 3.3·10^24"""
+    if n < 2:
+        return False
+    bases = [2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41]
+    if n in bases:
+        return True
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d, s = d // 2, s + 1
+    for base in bases:
+        x = pow(base, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def pollard_rho(n):
+    """
+    A non-trivial factor of an odd composite number by the Pollard's rho algorithm, x' = x^2 + c modulo n
+    with the Floyd's cycle detection, or None if none is found in RHO_ITERATIONS iterations.
+    See the page https://en.wikipedia.org/wiki/Pollard%27s_rho_algorithm
+    """
+    count = 0
+    for c in range(1, n):
+        x = y = 2
+        factor = 1
+        while factor == 1:
+            count += 1
+            if count > RHO_ITERATIONS:
+                return None
+            x = (x * x + c) % n
+            y = (y * y + c) % n
+            y = (y * y + c) % n
+            factor = gcd(x - y, n)
+        if factor != n:
+            return factor
+    return None
+
+
+def differentiate(f):
+    return [degree * x for degree, x in enumerate(f)][1:]
+
+
+def subtract(f, g):
+    size = max(len(f), len(g))
+    return trim([(f[i] if i < len(f) else 0) - (g[i] if i < len(g) else 0) for i in range(size)])
+
+
+def trim(f):
+    while f and not f[-1]:
+        f.pop()
+    return f
+
+
+def primitive(f):
+    """The polynomial divided by the gcd of its integer coefficients, with a positive leading coefficient"""
+    content = reduce(gcd, f, 0) * (-1 if f[-1] < 0 else 1)
+    return [x // content for x in f]
+
+
+def divide(f, g):
+    """
+    Quotient of the polynomial division of f by g, integer coefficients. g divides f exactly and is primitive,
+    then by the Gauss's lemma the quotient has integer coefficients
+    """
+    remainder = list(f)
+    quotient = [0] * (len(f) - len(g) + 1)
+    for shift in range(len(f) - len(g), -1, -1):
+        factor = remainder[shift + len(g) - 1] // g[-1]
+        quotient[shift] = factor
+        if factor:
+            remainder[shift:shift + len(g)] = [x - factor * y for x, y in zip(remainder[shift:shift + len(g)], g)]
+    return trim(quotient)
+
+
+def pseudo_remainder(f, g):
+    """
+    Remainder of the division of |lc(g)|^k·f by g with integer coefficients, without fractions,
+    divided by the gcd of its coefficients: a positive multiple of the remainder, as Sturm chains need
+    """
+    remainder = list(f)
+    lead, sign = abs(g[-1]), 1 if g[-1] > 0 else -1
+    while len(remainder) >= len(g):
+        factor, shift = remainder[-1] * sign, len(remainder) - len(g)
+        remainder = [x * lead for x in remainder]
+        remainder[shift:] = [x - factor * y for x, y in zip(remainder[shift:], g)]
+        trim(remainder)
+    content = reduce(gcd, remainder, 0)
+    return [x // content for x in remainder] if remainder else remainder
+
+
+def polynomial_gcd(f, g):
+    """
+    Primitive greatest common divisor of two polynomials with integer coefficients, by the Euclid's algorithm
+    on primitive pseudo-remainders, so that coefficients stay integers of moderate size
+    """
+    while g:
+        f, g = g, pseudo_remainder(f, g)
+    return primitive(f)
@@ -0,0 +1,155 @@
+"""
+Roots of numbers, computed by the Newton's method
+"""
+from collections import Counter
+from decimal import Decimal
+from fractions import Fraction
+from math import atan2, cos, frexp, sin
+
+from mathematics.exceptions import MathError
+
+# Number of iterations made by each method since the start, for instrumentation
+iterations = Counter()
+
+
+def iroot(n, degree=2):
+    """
+    Integer n-th root: the greatest integer whose power is not greater than n.
+    The integer Newton's method x' = ((degree - 1)·x + n // x^(degree - 1)) // degree
+    decreases from any start above the root down to it, see the page https://en.wikipedia.org/wiki/Integer_square_root
+    """
+    if n < 0:
+        raise MathError(f"{n} has no real root")
+    if n < 2:
+        return n
+
+    x = 1 << -(-n.bit_length() // degree)
+    count = 0
+    while True:
+        count += 1
+        y = ((degree - 1) * x + n // x ** (degree - 1)) // degree
+        if y >= x:
+            iterations['iroot'] += count
+            return x
+        x = y
+
+
+def root(n, degree=2):
+    """
+    Positive n-th root of a non-negative real number: exact for perfect powers of integers and fractions,
+    found by the Newton's method x' = ((degree - 1)·x + n / x^(degree - 1)) / degree otherwise,
+    which converges quadratically from the start above the root. For degree 2 it is the Heron's method.
+    """
+    if n < 0:
+        raise MathError(f"{n} has no real root")
+    if n == 0:
+        return 0
+
+    if isinstance(n, Decimal):
+        return decimal_root(n, degree)
+    if isinstance(n, Fraction):
+        numerator, denominator = iroot(n.numerator, degree), iroot(n.denominator, degree)
+        if numerator ** degree == n.numerator and denominator ** degree == n.denominator:
+            return Fraction(numerator, denominator)
+
+    if isinstance(n, float) and n.is_integer() and n < 1 << 53:
+        n = int(n)
+    if isinstance(n, int):
+        x = iroot(n, degree)
+        if x ** degree == n or n.bit_length() > 1000:
+            # Exact root, or the integer root of a number too big for floats
+            return x
+
+    n = float(n)
+    _, exponent = frexp(n)
+    # n < 2^exponent, so the root is less than 2^ceil(exponent / degree)
+    x = 2.0 ** -(-exponent // degree)
+    count = 0
+    while True:
+        count += 1
+        y = ((degree - 1) * x + n / x ** (degree - 1)) / degree
+        if y >= x:
+            iterations['newton'] += count
+            return x
+        x = y
+
+
+def decimal_root(n, degree):
+    """
+    Positive n-th root of a positive decimal number, to the precision of the current decimal context:
+    the decimal square root, the same Newton's method as root for other degrees
+    """
+    if degree == 2:
+        return n.sqrt()
+
+    # n < 10^(adjusted + 1), so the root is less than 10^ceil((adjusted + 1) / degree)
+    x = Decimal(10) ** -(-(n.adjusted() + 1) // degree)
+    count = 0
+    while True:
+        count += 1
+        y = ((degree - 1) * x + n / x ** (degree - 1)) / degree
+        if y >= x:
+            iterations['decimal'] += count
+            return x
+        x = y
+
+
+def sqrt(n):
+    return root(n, 2)
+
+
+def complex_sqrt(real, imag):
+    """
+    Principal square root of the real + imag·i complex number as its (real, imag) parts:
+    the root with a positive real part, or with a positive imaginary part on the negative real axis
+    """
+    if not imag:
+        return (sqrt(real), 0) if real >= 0 else (0, sqrt(-real))
+
+    modulus = sqrt(real * real + imag * imag)
+    # The root part computed directly is the one without cancellation, the other one follows from it
+    if real >= 0:
+        t = sqrt((modulus + real) / 2)
+        return t, imag / (2 * t)
+    t = sqrt((modulus - real) / 2)
+    return abs(imag) / (2 * t), t if imag > 0 else -t
+
+
+def complex_root(real, imag, degree):
+    """Principal n-th root of the real + imag·i complex number as its (real, imag) parts, in the polar form"""
+    if degree == 2:
+        return complex_sqrt(real, imag)
+    if not imag and real >= 0:
+        return root(real, degree), 0
+
+    modulus = root(sqrt(real * real + imag * imag), degree)
+    angle = atan2(imag, real) / degree
+    if not isinstance(modulus, Decimal):
+        return modulus * cos(angle), modulus * sin(angle)
+    # The angle is a float, decimal roots are refined from there
+    return refine_root((real, imag), (modulus * Decimal(cos(angle)), modulus * Decimal(sin(angle))), degree)
+
+
+def refine_root(number, approximation, degree):
+    """
+    Refine the approximation of an n-th root of a complex number given as (real, imag) parts,
+    using the Newton's method z' = ((degree - 1)·z + number / z^(degree - 1)) / degree
+    until its steps stop getting smaller, i.e. up to the precision the parts are computed with
+    """
+    (a, b), (x, y) = number, approximation
+    step, count = None, 0
+    while True:
+        count += 1
+        # p = z^(degree - 1), then the quotient number / p
+        p_real, p_imag = 1, 0
+        for _ in range(degree - 1):
+            p_real, p_imag = p_real * x - p_imag * y, p_real * y + p_imag * x
+        norm = p_real * p_real + p_imag * p_imag
+        q_real, q_imag = (a * p_real + b * p_imag) / norm, (b * p_real - a * p_imag) / norm
+
+        next_x, next_y = ((degree - 1) * x + q_real) / degree, ((degree - 1) * y + q_imag) / degree
+        next_step = abs(next_x - x) + abs(next_y - y)
+        if step is not None and next_step >= step or not next_step:
+            iterations['refine'] += count
+            return (next_x, next_y) if not next_step else (x, y)
+        x, y, step = next_x, next_y, next_step
@@ -3,3 +3,27 @@ DEFAULT_ERROR = 0.0000001
 
 # Iterations number for approximating algorithms
 DEFAULT_ITERATIONS = 10000000
+
+# Significant digits of the decimal numbers backend, see mathematics.backends
+DECIMAL_PRECISION = 50
+
+# Maximum number of distinct terms a polynomial product may have
+MAX_TERMS = 100000
+
+# Minimal sizes of polynomials multiplied with the Karatsuba algorithm and by Kronecker substitution,
+# see ./benchmarks.py multiplication
+KARATSUBA_THRESHOLD = 32
+KRONECKER_THRESHOLD = 40
+
+# Maximum number of terms of sparse polynomials raised to powers by the multinomial expansion instead of squaring
+MULTINOMIAL_TERMS = 4
+
+# Relative accuracy and maximum iterations of the numeric roots of polynomials, see mathematics.solvers.aberth
+ROOT_TOLERANCE = 1e-12
+ROOT_ITERATIONS = 1000
+
+# Maximum number of p/q candidates for the rational roots of a polynomial, see mathematics.rational
+MAX_RATIONAL_CANDIDATES = 100000
+
+# Maximum number of bits of integer powers
+MAX_POWER_BITS = 1 << 20
@@ -0,0 +1,280 @@
+"""
+Roots of univariate polynomials given as lists of Complex coefficients from degree 0, see Polynomial.coefficients
+"""
+import cmath
+from decimal import Decimal, localcontext
+from math import pi
+
+from mathematics import DEFAULT_ERROR, ROOT_ITERATIONS, ROOT_TOLERANCE, format_number
+from mathematics.backends import active
+from mathematics.numbers import ONE, make
+from mathematics.roots import iterations
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Rows of the matrix of root differences computed at once by the numpy Aberth-Ehrlich iterations
+ABERTH_BLOCK = 256
+
+# Digits added to decimals while polishing roots, so that the digits shown are right, see polish
+GUARD_DIGITS = 5
+
+
+def solve(coeffs):
+    """
+    All the roots of a polynomial of degree 1 or more: by formulas up to degree 4, by the Aberth-Ehrlich method above,
+    their negligible parts being zeroed, see clean.
+    Aberth-Ehrlich roots are floats, polished to the precision of decimal numbers with the decimal backend, see polish
+    """
+    degree = len(coeffs) - 1
+    if degree == 1:
+        return [-coeffs[0] / coeffs[1]]
+    if degree > 4:
+        backend = active()
+        roots = [clean(make(x.real, x.imag), DEFAULT_ERROR) for x in aberth(coeffs)]
+        if backend.precision is None:
+            return roots
+        return [clean(polish(coeffs, x, backend.error), backend.error) for x in roots]
+    roots = quadratic(coeffs) if degree == 2 else cubic(coeffs) if degree == 3 else quartic(coeffs)
+    return [clean(x, active().error) for x in roots]
+
+
+def quadratic(coeffs, real=False):
+    """
+    Both roots of c + b·x + a·x^2 by the quadratic formula.
+    With real, the roots are known to be real, so a discriminant that is negative by rounding errors counts as zero
+    """
+    c, b, a = coeffs
+    discriminant = b * b - 4 * a * c
+    if real and discriminant < 0:
+        discriminant = 0 * discriminant
+    root = discriminant ** 0.5
+    return (-b + root) / (2 * a), (-b - root) / (2 * a)
+
+
+def cubic(coeffs):
+    """
+    The three roots of d + c·x + b·x^2 + a·x^3: a first root by the Cardano's formula
+    x = -(b + C + Δ0 / C) / 3a, where C^3 = (Δ1 ± √(Δ1^2 - 4·Δ0^3)) / 2, Δ0 = b^2 - 3ac
+    and Δ1 = 2b^3 - 9abc + 27a^2·d, then the roots of the quadratic quotient of the polynomial by (x - x1).
+    See the page https://en.wikipedia.org/wiki/Cubic_equation#General_cubic_formula
+
+    With real coefficients, Δ1^2 - 4·Δ0^3 = -27a^2·Δ tells how many roots are real from the discriminant Δ sign:
+    one if it is positive, and C is a real cube root, all of them otherwise,
+    and their imaginary parts are rounding errors
+    """
+    d, c, b, a = coeffs
+    delta0 = b * b - 3 * a * c
+    delta1 = 2 * b * b * b - 9 * a * b * c + 27 * a * a * d
+    if delta0 == 0 and delta1 == 0:
+        x = -b / (3 * a)
+        return x, x, x
+
+    real = not any(x.imag for x in coeffs)
+    radicand = delta1 * delta1 - 4 * delta0 * delta0 * delta0
+    root = radicand ** 0.5
+    if real and radicand > 0:
+        # The sign of Δ1 avoids cancellation, the real cube root keeps the first root real
+        cube = (delta1 + root) / 2 if delta1 >= 0 else (delta1 - root) / 2
+        c_root = cube ** (1 / 3) if cube >= 0 else -((-cube) ** (1 / 3))
+    else:
+        plus, minus = (delta1 + root) / 2, (delta1 - root) / 2
+        cube = plus if modulus(plus) >= modulus(minus) else minus
+        c_root = cube ** (1 / 3)
+
+    x1 = -(b + c_root + delta0 / c_root) / (3 * a)
+    if real:
+        x1 = x1.real * ONE
+    # Synthetic division by (x - x1)
+    quotient_b = b + a * x1
+    return (x1,) + quadratic([c + quotient_b * x1, quotient_b, a], real=real and radicand <= 0)
+
+
+def quartic(coeffs):
+    """
+    The four roots of e + d·x + c·x^2 + b·x^3 + a·x^4 by the Ferrari's method: the depressed quartic
+    y^4 + p·y^2 + q·y + r, where x = y - b / 4a, is (y^2 + p/2 + m)^2 - (s·y - q / 2s)^2 with s = √2m
+    for m a root of the resolvent cubic 8m^3 + 8p·m^2 + (2p^2 - 8r)·m - q^2, so it is a product of two quadratics.
+    See the page https://en.wikipedia.org/wiki/Quartic_function#Ferrari's_solution
+
+    With real coefficients, the resolvent cubic has a positive real root, which makes both quadratics real
+    """
+    e, d, c, b, a = coeffs
+    b, c, d, e = b / a, c / a, d / a, e / a
+    p = c - 3 * b * b / 8
+    q = d - b * c / 2 + b * b * b / 8
+    r = e - b * d / 4 + b * b * c / 16 - 3 * b * b * b * b / 256
+
+    if q == 0:
+        # Biquadratic: y^2 is a root of z^2 + p·z + r
+        roots = []
+        for z in quadratic([r, p, ONE]):
+            root = z ** 0.5
+            roots += [root, -root]
+    else:
+        resolvent = cubic([-q * q, 2 * p * p - 8 * r, 8 * p, 8 * ONE])
+        if not any(x.imag for x in coeffs):
+            m = max(x for x in resolvent if not x.imag)
+        else:
+            m = max(resolvent, key=modulus)
+        s = (2 * m) ** 0.5
+        roots = quadratic([p / 2 + m + q / (2 * s), -s, ONE]) + quadratic([p / 2 + m - q / (2 * s), s, ONE])
+
+    return tuple(y - b / 4 for y in roots)
+
+
+def clean(root, error):
+    """Zero the real or imaginary part of a root when it is negligible beside the other one, i.e. a rounding error"""
+    size = abs(root.real) + abs(root.imag)
+    return make(0 if abs(root.real) <= error * size else root.real, 0 if abs(root.imag) <= error * size else root.imag)
+
+
+def modulus(x):
+    """Squared modulus of a Complex number, to compare moduli"""
+    return x.real * x.real + x.imag * x.imag
+
+
+def order(root):
+    """
+    Sort key of roots: real roots first, then by real and imaginary parts rounded to 6 significant digits, as shown,
+    so that conjugate pairs always come in the same order whatever the rounding errors of their real parts
+    """
+    return (root.imag != 0, Decimal(format_number(root.real, '.6g')), Decimal(format_number(root.imag, '.6g')),
+            root.real, root.imag)
+
+
+def aberth(coeffs, tolerance=ROOT_TOLERANCE, max_iterations=ROOT_ITERATIONS):
+    """
+    All the roots of a polynomial of any degree by the Aberth-Ehrlich method, as python complex numbers.
+    Every root estimate z_k gets the step w / (1 - w·Σ 1 / (z_k - z_j)) for j != k, where w = p(z_k) / p'(z_k)
+    is the Newton's step, until the steps are below tolerance relative to the roots, or max_iterations.
+    See the page https://en.wikipedia.org/wiki/Aberth_method
+
+    Estimates start on a circle around zero, the roots at zero being found beforehand.
+    All the estimates are updated together in one vectorized step with numpy when it is installed,
+    one after the other with python complex numbers otherwise. The iterations made are counted
+    in mathematics.roots.iterations
+    """
+    coeffs = [complex(x.real, x.imag) for x in coeffs]
+    zeros = next(index for index, x in enumerate(coeffs) if x)
+    coeffs = coeffs[zeros:]
+    degree = len(coeffs) - 1
+    if degree == 0:
+        return [0j] * zeros
+
+    radius = (abs(coeffs[0]) / abs(coeffs[-1])) ** (1 / degree)
+    estimates = [radius * cmath.exp(1j * (2 * pi * k / degree + pi / (2 * degree))) for k in range(degree)]
+    solve = aberth_numpy if numpy is not None else aberth_python
+    return [0j] * zeros + list(solve(coeffs, estimates, tolerance, max_iterations))
+
+
+def aberth_python(coeffs, roots, tolerance, max_iterations):
+    """Aberth-Ehrlich iterations updating the roots one after the other, each with the latest other roots"""
+    active = set(range(len(roots)))
+    count = 0
+    while active and count < max_iterations:
+        count += 1
+        for k in list(active):
+            z = roots[k]
+            w = newton_step(coeffs, z)
+            if w:
+                others = roots[:k] + roots[k + 1:]
+                try:
+                    total = sum([1 / (z - x) for x in others])
+                except ZeroDivisionError:
+                    # Estimates met, the others at the same point are left out
+                    total = sum([1 / (z - x) for x in others if x != z])
+                w = w / (1 - w * total)
+            roots[k] = z - w
+            if abs(w) <= tolerance * abs(z):
+                active.discard(k)
+    iterations['aberth'] += count
+    return roots
+
+
+def aberth_numpy(coeffs, roots, tolerance, max_iterations):
+    """Aberth-Ehrlich iterations updating all the active roots at once"""
+    roots = numpy.array(roots)
+    active = numpy.arange(len(roots))
+    count = 0
+    while len(active) and count < max_iterations:
+        count += 1
+        z = roots[active]
+        w = newton_steps(coeffs, z)
+        total = numpy.zeros(len(z), dtype=complex)
+        # By blocks of rows, the whole matrix of differences may not fit in memory
+        for start in range(0, len(z), ABERTH_BLOCK):
+            with numpy.errstate(divide='ignore', invalid='ignore'):
+                inverse = 1 / (z[start:start + ABERTH_BLOCK, None] - roots[None, :])
+            inverse[~numpy.isfinite(inverse)] = 0
+            total[start:start + ABERTH_BLOCK] = inverse.sum(axis=1)
+        w = numpy.where(w != 0, w / (1 - w * total), 0)
+        roots[active] = z - w
+        active = active[numpy.abs(w) > tolerance * numpy.abs(z)]
+    iterations['aberth'] += count
+    return roots.tolist()
+
+
+def polish(coeffs, root, error, max_iterations=ROOT_ITERATIONS):
+    """
+    Refine a root found as floats with the Newton's steps in decimal numbers (see newton_step)
+    until a step is below the error relative to the root, or no smaller than the previous one, rounding errors
+    of the decimals being reached: near a simple root, exact digits double with every step
+    """
+    z = make(Decimal(root.real), Decimal(root.imag))
+    count, previous = 0, None
+    with localcontext() as context:
+        context.prec += GUARD_DIGITS
+        while count < max_iterations:
+            count += 1
+            step = newton_step(coeffs, z)
+            size = modulus(step)
+            if previous is not None and size >= previous:
+                break
+            z -= step
+            if size <= error * error * modulus(z):
+                break
+            previous = size
+    iterations['polish'] += count
+    # Rounded to the precision
+    return make(+z.real, +z.imag)
+
+
+def newton_step(coeffs, z):
+    """
+    The Newton's step p(z) / p'(z) of a polynomial given as its coefficients from degree 0, by the Horner's method.
+    Out of the unit circle, the reversed polynomial q(y) = y^n·p(1/y) is evaluated at y = 1/z instead,
+    as p(z) / p'(z) = q(y) / y(n·q(y) - y·q'(y)), so that high degrees do not overflow
+    """
+    if modulus(z) <= 1:
+        value, derivative = 0, 0
+        for coeff in reversed(coeffs):
+            derivative = derivative * z + value
+            value = value * z + coeff
+        return value / derivative if derivative else value
+
+    y = 1 / z
+    value, derivative = 0, 0
+    for coeff in coeffs:
+        derivative = derivative * y + value
+        value = value * y + coeff
+    denominator = y * ((len(coeffs) - 1) * value - y * derivative)
+    return value / denominator if denominator else value
+
+
+def newton_steps(coeffs, z):
+    """The Newton's steps of the polynomial at all the z points at once, see newton_step"""
+    steps = numpy.empty(len(z), dtype=complex)
+    inner = numpy.abs(z) <= 1
+    for points, ordered, reverse in [(z[inner], coeffs[::-1], False), (1 / z[~inner], coeffs, True)]:
+        value, derivative = numpy.zeros(len(points), dtype=complex), numpy.zeros(len(points), dtype=complex)
+        for coeff in ordered:
+            derivative = derivative * points + value
+            value = value * points + coeff
+        if reverse:
+            derivative = points * ((len(coeffs) - 1) * value - points * derivative)
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            steps[inner if not reverse else ~inner] = numpy.where(derivative != 0, value / derivative, value)
+    return steps
@@ -0,0 +1,133 @@
+"""
+Real roots of univariate polynomials with real coefficients by Sturm sequences: counting, isolation and refinement
+"""
+from fractions import Fraction
+from math import isfinite
+
+from mathematics import illinois, parse_number
+from mathematics.exceptions import MathError
+from mathematics.rational import differentiate, divide, integers, primitive, pseudo_remainder
+
+# Value standing for the polynomial values that overflow floats, with their sign, see Sturm.value
+HUGE = 1e300
+
+
+class Sturm:
+    """
+    This class represents the Sturm chain of a polynomial p: p0 = p, p1 = p', p(k + 1) = -rem(p(k - 1), p(k)),
+    built once, the number of distinct real roots in (a, b] being V(a) - V(b), where V(x) is the number
+    of sign changes along the chain at x. See the page https://en.wikipedia.org/wiki/Sturm%27s_theorem
+
+    For the x^3 - x polynomial there will be following data structure:
+
+    chain: [[0, -1, 0, 1], [-1, 0, 3], [0, 1], [1]]
+    square_free: [0, -1, 0, 1], p divided by the last polynomial of the chain, i.e. gcd(p, p')
+    bound: 3, all the real roots are in (-bound, bound)
+
+    Coefficients are integers from degree 0, those of the polynomial scaled to integers exactly (floats and decimals
+    included) and positive multiples of the remainders, so that signs are exact.
+    """
+    __slots__ = ('chain', 'square_free', 'bound', 'floats')
+
+    def __init__(self, coeffs):
+        """Sturm chain of a polynomial given as its real coefficients from degree 0, of degree 1 or more"""
+        coeffs = integers(coeffs)
+        chain = [coeffs, differentiate(coeffs)]
+        while len(chain[-1]) > 1:
+            remainder = pseudo_remainder(chain[-2], chain[-1])
+            if not remainder:
+                break
+            chain.append([-x for x in remainder])
+
+        self.chain = chain
+        self.square_free = divide(coeffs, primitive(chain[-1])) if len(chain[-1]) > 1 else coeffs
+        # Cauchy's bound, rounded up
+        self.bound = 2 + max(abs(x) for x in coeffs[:-1]) // abs(coeffs[-1])
+        # Coefficients as floats of at most 1 in modulus, for the refinement
+        scale = max(abs(x) for x in self.square_free)
+        self.floats = [float(Fraction(x, scale)) for x in self.square_free]
+
+    def variations(self, x):
+        """Number of sign changes along the chain at x, a rational number or an infinity, see sign"""
+        signs = [sign for sign in (self.sign(f, x) for f in self.chain) if sign]
+        return sum(a != b for a, b in zip(signs, signs[1:]))
+
+    @staticmethod
+    def sign(coeffs, x):
+        """
+        Exact sign of the polynomial at x: at p/q, the sign of q^n·f(p/q) = sum of a(i)·p^i·q^(n - i) by the Horner's
+        method on integers. At '-inf' and '+inf', the sign of the leading term
+        """
+        if isinstance(x, str):
+            negative = x == '-inf' and len(coeffs) % 2 == 0
+            return -1 if (coeffs[-1] < 0) != negative else 1
+
+        x = Fraction(x)
+        p, q = x.numerator, x.denominator
+        value, power = 0, 1
+        for coeff in reversed(coeffs):
+            value = value * p + coeff * power
+            power *= q
+        return (value > 0) - (value < 0)
+
+    def count(self, a=None, b=None):
+        """Number of distinct real roots in (a, b], None for infinite endpoints"""
+        a = '-inf' if a is None else a
+        b = '+inf' if b is None else b
+        if not isinstance(a, str) and not isinstance(b, str) and a >= b:
+            raise MathError(f"The interval ({a}, {b}] is empty")
+        return self.variations(a) - self.variations(b)
+
+    def isolate(self, a=None, b=None):
+        """
+        Sorted disjoint (lo, hi] intervals with rational endpoints, each with one of the distinct real roots in (a, b],
+        by halving intervals with more than one root. Infinite endpoints stand for the bounds of the roots
+        """
+        a = Fraction(-self.bound if a is None else a)
+        b = Fraction(self.bound if b is None else b)
+        if a >= b:
+            raise MathError(f"The interval ({a}, {b}] is empty")
+
+        intervals = []
+        stack = [(a, b, self.variations(a), self.variations(b))]
+        while stack:
+            lo, hi, v_lo, v_hi = stack.pop()
+            if v_lo - v_hi == 1:
+                intervals.append((lo, hi))
+            elif v_lo - v_hi > 1:
+                mid = (lo + hi) / 2
+                v_mid = self.variations(mid)
+                stack += [(mid, hi, v_mid, v_hi), (lo, mid, v_lo, v_mid)]
+        return sorted(intervals)
+
+    def roots(self, a=None, b=None, precision=None):
+        """
+        Sorted distinct real roots in (a, b]: exact when an interval ends at a root, otherwise found as floats
+        by the Illinois method on the square-free polynomial, which changes its sign on each isolating interval
+        """
+        roots = []
+        for lo, hi in self.isolate(a, b):
+            while not self.sign(self.square_free, lo):
+                # lo is the root of the previous interval, closer to this root than any point tried so far
+                mid = (lo + hi) / 2
+                if self.count(mid, hi):
+                    lo = mid
+                else:
+                    hi = mid
+            if not self.sign(self.square_free, hi):
+                roots.append(parse_number(hi))
+            else:
+                roots.append(illinois(self.value, float(lo), float(hi), precision))
+        return roots
+
+    def value(self, x):
+        """Value of the square-free polynomial (scaled) at a float by Horner's method, huge values with their sign"""
+        value = 0.0
+        try:
+            for coeff in reversed(self.floats):
+                value = value * x + coeff
+            if isfinite(value):
+                return value
+        except OverflowError:
+            pass
+        return HUGE * self.sign(self.square_free, x)
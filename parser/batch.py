@@ -0,0 +1,50 @@
+"""
+Solving many independent equations across a pool of processes
+"""
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from os import cpu_count
+
+from mathematics.backends import FLOAT
+from parser.computor import Computor, default_symbols
+
+# Number of lines read ahead and dispatched to the pool at once
+BLOCK_SIZE = 4096
+
+# The computor of the current worker process
+computor = None
+
+
+def start_worker(symbols, cache_size, cache_file, backend):
+    global computor
+    computor = Computor(symbols=symbols, cache_size=cache_size, cache_file=cache_file, backend=backend)
+
+
+def execute(text):
+    """Interpret a single equation, just as a brand new computor would"""
+    computor.variables = {}
+    return computor.execute(text)
+
+
+def run_batch(lines, symbols=default_symbols, jobs=None, block_size=BLOCK_SIZE, cache_size=0, cache_file=None,
+              backend=FLOAT):
+    """
+    Generate the outputs of Computor.execute for the given lines, one equation per line,
+    in the same order as the lines. Blank lines are skipped.
+    Each worker process may keep its own result cache of cache_size entries,
+    and all of them may share the cache_file disk cache. Numbers are computed with the given backend.
+
+    Lines are read by blocks, so the memory used does not depend on the number of lines.
+    """
+    jobs = jobs or cpu_count() or 1
+    lines = iter(lines)
+
+    initargs = (symbols, cache_size, cache_file, backend)
+    with ProcessPoolExecutor(max_workers=jobs, initializer=start_worker, initargs=initargs) as executor:
+        while True:
+            block = [line.strip() for line in islice(lines, block_size)]
+            if not block:
+                break
+
+            block = [line for line in block if line]
+            yield from executor.map(execute, block, chunksize=max(1, len(block) // (4 * jobs)))
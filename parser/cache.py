@@ -0,0 +1,173 @@
+"""
+Caching parsing results, in memory or on disk
+"""
+import pickle
+import sqlite3
+from collections import OrderedDict
+from hashlib import sha256
+from io import BytesIO
+from time import time_ns
+
+# Bump when cached results are no longer valid, e.g. the way they are computed or shown changes
+CACHE_VERSION = 4
+
+# Seconds a process waits for another one writing to the same disk cache
+DISK_TIMEOUT = 30
+
+# Number of entries a disk cache keeps by default
+DISK_SIZE = 100000
+
+# The only classes a disk cache loads, those results are made of, see SafeUnpickler
+SAFE_CLASSES = {
+    ('parser.cache', 'CacheEntry'),
+    ('mathematics.numbers', 'Complex'), ('mathematics.numbers', 'Real'),
+    ('mathematics.polynomial', 'Polynomial'), ('mathematics.polynomial', 'Term'),
+    ('mathematics.polynomial', 'Variable'), ('mathematics.dense', 'Dense'),
+    # Numbers of the backends, and of dense coefficients
+    ('builtins', 'complex'), ('decimal', 'Decimal'), ('fractions', 'Fraction'),
+}
+
+
+class CacheEntry:
+    """
+    Cached result of a text parsing:
+    result: the parsing result, i.e. Computor.result
+    declared: the variables the parsing declared, to declare them again on every hit
+    output: the text shown for the result, once computed by Computor.execute
+    """
+    def __init__(self, result, declared, output=None):
+        self.result = result
+        self.declared = declared
+        self.output = output
+
+
+class ResultCache:
+    """
+    Bounded least recently used cache of parsing results, counting hits, misses and evictions.
+    It may stand in front of a slower parent cache (e.g. a DiskCache): misses are looked up in the parent,
+    and entries are put in both.
+    """
+
+    def __init__(self, size, parent=None):
+        self.size = size
+        self.parent = parent
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            if self.parent is not None:
+                entry = self.parent.get(key)
+                if entry is not None:
+                    self.store(key, entry)
+            return entry
+
+        self.hits += 1
+        self.entries.move_to_end(key)
+        return entry
+
+    def put(self, key, entry):
+        self.store(key, entry)
+        if self.parent is not None:
+            self.parent.put(key, entry)
+
+    def store(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __str__(self):
+        text = f"{len(self)}/{self.size} entries, {self.hits} hits, {self.misses} misses, {self.evictions} evictions"
+        return text if self.parent is None else f"{text}; {self.parent}"
+
+
+class SafeUnpickler(pickle.Unpickler):
+    """
+    Unpickler loading cache entries only: their numbers and polynomials are made of SAFE_CLASSES,
+    any other global (e.g. a function to call) is refused
+    """
+
+    def find_class(self, module, name):
+        if (module, name) in SAFE_CLASSES:
+            return super().find_class(module, name)
+        raise pickle.UnpicklingError(f"Unexpected global {module}.{name} in a cache entry")
+
+
+class DiskCache:
+    """
+    Least recently used cache of parsing results persisted in a SQLite database,
+    shared by all the processes using the same file, counting hits, misses and evictions of this process.
+
+    Keys are stored as digests of their text, entries are pickled and loaded by a SafeUnpickler,
+    rows that do not load being misses. The file should still be writable by trusted users only.
+    Every write is a transaction, concurrent processes wait for each other up to DISK_TIMEOUT seconds.
+    """
+
+    def __init__(self, path, size=DISK_SIZE):
+        self.path = path
+        self.size = size
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.connection = sqlite3.connect(path, timeout=DISK_TIMEOUT, isolation_level=None)
+        # Readers don't wait for the writer in write-ahead log mode
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        with self.connection:
+            self.connection.execute('BEGIN')
+            self.connection.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'key TEXT PRIMARY KEY, entry BLOB NOT NULL, accessed INTEGER NOT NULL)'
+            )
+            self.connection.execute('CREATE INDEX IF NOT EXISTS results_accessed ON results (accessed)')
+
+    @staticmethod
+    def digest(key):
+        return sha256(f"{CACHE_VERSION} {key!r}".encode()).hexdigest()
+
+    def get(self, key):
+        digest = self.digest(key)
+        row = self.connection.execute('SELECT entry FROM results WHERE key = ?', (digest,)).fetchone()
+        try:
+            entry = SafeUnpickler(BytesIO(row[0])).load() if row is not None else None
+        except (pickle.UnpicklingError, AttributeError, ImportError, EOFError, TypeError, ValueError):
+            entry = None
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        with self.connection:
+            self.connection.execute('BEGIN')
+            self.connection.execute('UPDATE results SET accessed = ? WHERE key = ?', (time_ns(), digest))
+        return entry
+
+    def put(self, key, entry):
+        data = pickle.dumps(entry, protocol=pickle.HIGHEST_PROTOCOL)
+        with self.connection:
+            self.connection.execute('BEGIN IMMEDIATE')
+            self.connection.execute(
+                'INSERT OR REPLACE INTO results (key, entry, accessed) VALUES (?, ?, ?)',
+                (self.digest(key), data, time_ns()),
+            )
+            evicted = self.connection.execute(
+                'DELETE FROM results WHERE key IN '
+                '(SELECT key FROM results ORDER BY accessed DESC LIMIT -1 OFFSET ?)',
+                (self.size,),
+            ).rowcount
+        self.evictions += evicted
+
+    def __len__(self):
+        return self.connection.execute('SELECT COUNT(*) FROM results').fetchone()[0]
+
+    def __str__(self):
+        return (f"{len(self)}/{self.size} entries on disk, "
+                f"{self.hits} hits, {self.misses} misses, {self.evictions} evictions")
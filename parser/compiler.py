@@ -0,0 +1,97 @@
+"""
+Parse once, evaluate many: compiling texts into reusable expressions
+"""
+from collections import namedtuple
+from functools import lru_cache
+
+from mathematics.backends import FLOAT
+from parser.computor import Computor, default_functions, default_symbols
+
+# Number of compiled texts kept by compile_text
+CACHE_SIZE = 1024
+
+
+class Scope(namedtuple('Scope', ['variables', 'functions', 'symbols'])):
+    """
+    Evaluation context of a compiled expression, providing to the symbols
+    the same interface as the computor does while parsing
+    """
+
+    def contains(self, symbol):
+        return symbol in self.symbols
+
+
+class Expression(namedtuple('Expression', ['text', 'code', 'symbols', 'backend'])):
+    """
+    Immutable compiled expression.
+
+    For the 'x^2 - 1' text there will be following data structure:
+
+    code: (
+        (0, Name.evaluate, 'x'),
+        (0, Number.evaluate, Real(2)),
+        (2, Power.binary, None),
+        (0, Number.evaluate, Real(1)),
+        (2, Minus.binary, None),
+    )
+    symbols: frozenset({Name, Power, Number, Minus, End})
+    backend: FLOAT, the numeric backend of the compiling computor, see mathematics.backends
+
+    code is a postfix sequence of (arity, function, value) instructions, evaluated with a stack,
+    so evaluating it again does not involve any tokenizing, parsing or recursion.
+    """
+
+    def evaluate(self, variables, functions=default_functions):
+        """
+        Compute the expression value with the given variables mapping,
+        which gets the new variables on assignment, just like Computor.variables
+        """
+        scope = Scope(variables=variables, functions=functions, symbols=self.symbols)
+        stack = []
+
+        with self.backend.activated():
+            for arity, function, value in self.code:
+                if arity == 0:
+                    stack.append(function(scope, value))
+                elif arity == 1:
+                    stack.append(function(stack.pop()))
+                else:
+                    second = stack.pop()
+                    stack.append(function(stack.pop(), second))
+
+        return stack.pop()
+
+
+class Compiler(Computor):
+    """
+    Computor emitting the code of an expression instead of computing its value.
+    The driver is unchanged: operands are always parsed before their operator hook is called,
+    so instructions come out in postfix order.
+    """
+    def __init__(self, symbols=default_symbols, backend=FLOAT):
+        super().__init__(symbols=symbols, backend=backend)
+        self.code = []
+
+    def literal(self, symbol, value):
+        self.code.append((0, symbol.evaluate, value))
+
+    def unary(self, symbol, operand):
+        self.code.append((1, symbol.unary, None))
+
+    def binary(self, symbol, first, second):
+        self.code.append((2, symbol.binary, None))
+
+    def compile(self, text):
+        self.code = []
+        self.parse(text)
+        return Expression(
+            text=text,
+            code=tuple(self.code),
+            symbols=self.summary.symbols,
+            backend=self.backend,
+        )
+
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_text(symbols, text, backend=FLOAT):
+    return Compiler(symbols=symbols, backend=backend).compile(text)
@@ -1,7 +1,8 @@
-import re
-
 import mathematics
+from mathematics.backends import FLOAT
 from mathematics.exceptions import MathError
+from parser.cache import CacheEntry, DiskCache, ResultCache
+from parser.lexer import Lexer
 from parser.symbols import *
 
 
@@ -21,92 +22,341 @@ default_functions = {
 class Computor:
     """
     Mathematics language interpreter using the Top-down operator precedence parsing algorithm.
+
+    Numbers are computed with the given numeric backend: floats, decimals of some precision or exact fractions,
+    see mathematics.backends.
+
+    Results may be cached in memory for the last cache_size texts, and on disk in the cache_file SQLite database
+    shared by all computors using it, see parser.cache.
     """
-    def __init__(self, symbols=default_symbols, functions=default_functions):
+    def __init__(self, symbols=default_symbols, functions=default_functions, cache_size=0, cache_file=None,
+                 backend=FLOAT):
+        symbols = numbers(symbols, backend)
+        self.backend = backend
         self.symbols = {x.id(): x for x in symbols}
+        self.lexer = Lexer.compile(tuple(symbols))
         self.functions = functions
-        self.tokens = []
+        self.cache = DiskCache(cache_file) if cache_file else None
+        if cache_size:
+            self.cache = ResultCache(cache_size, parent=self.cache)
+        self.key = None
+        self.entry = None
         self.variables = {}
         self.text = None
-        self.tokens_queue = None
-        self.current_token = None
+        self.kinds = None
+        self.starts = None
+        self.ends = None
+        self.values = None
+        self.summary = None
+        self.position = 0
         self.result = None
 
     def tokenize(self):
         """
-        Tokenize self.text and assign two attributes:
-        - self.tokens — list of all token instances found in the text
-        - self.tokens_queue — state-maintaining iterator through self.tokens
+        Tokenize self.text into the compact parallel arrays (see parser.lexer.Tokens):
+        - self.kinds — symbol kind codes, indexes in self.lexer.classes
+        - self.starts, self.ends — token offsets in self.text
+        - self.values — literal values cleared at tokenizing time
+        - self.summary — structural facts about the text, see parser.lexer.Summary
+        and reset self.position, the index of the current token
         """
-        # regex will be like r'\s*(?P<NAME>[a-zA-Z]+)|(?P<NUMBER>(?:[0-9\.]+i?)|i)|(?P<PLUS>\+)|(?P<MINUS>-)'
-        token_regex = r'\s*' + r'|'.join([f'(?P<{x.id()}>{x.pattern})' for x in self.symbols.values()])
-        try:
-            self.tokens = [
-                self.symbols[match.lastgroup](self, match.group(match.lastgroup))
-                for match in re.finditer(token_regex, self.text)
-            ] + [End()]
+        self.kinds, self.starts, self.ends, self.values, self.summary = self.lexer.scan(self.text)
+        self.position = 0
 
-            self.tokens_queue = (token for token in self.tokens)
+    def token(self, index):
+        """Materialize the symbol instance of the token at the given index"""
+        symbol = self.lexer.classes[self.kinds[index]]
+        return symbol(self, self.text[self.starts[index]:self.ends[index]])
 
-        except KeyError:
-            raise SyntaxError("Unknown operator")
+    @property
+    def tokens(self):
+        """List of all token instances found in the text, built on demand"""
+        return [self.token(index) for index in range(len(self.kinds))]
 
-    def advance(self, to_class):
-        """
-        Advance to the next token of given type and return the intermediate result,
-        useful for handling parentheses
-        """
-        expr = self.expression()
-        if self.current_token.id() != to_class.id():
-            raise SyntaxError(f"Expected {to_class.id()}")
-        self.current_token = next(self.tokens_queue)
-        return expr
+    @property
+    def current_token(self):
+        return self.token(self.position)
+
+    def contains(self, symbol):
+        """Check whether the text has a token of the given symbol class"""
+        return self.summary.contains(symbol)
+
+    def next(self):
+        """Move on to the next token and return the index of the current one"""
+        index = self.position
+        if self.kinds[index] == self.lexer.end:
+            raise StopIteration
+        self.position += 1
+        return index
+
+    # Hooks computing values right away, see parser.symbols
+
+    def literal(self, symbol, value):
+        return symbol.evaluate(self, value)
+
+    def unary(self, symbol, operand):
+        return symbol.unary(operand)
+
+    def binary(self, symbol, first, second):
+        return symbol.binary(first, second)
 
     def expression(self, previous_bp=0):
         """
-        Recursive parsing and interpreting function.
+        Parsing and interpreting function.
 
         The previous_bp (previous binding power) parameter means the precedence level of the previous context.
         We will continue interpreting tokens while current binding power stays higher than the previous,
         then return the result to caller.
 
-        Token classes with their semantics are defined in the parser.symbols module.
+        Token classes with their grammar and semantics are defined in the parser.symbols module.
         Each token has two different modes of interpretation:
 
-        1) prefix method returns a value for bare or prefix token position, e.g.:
+        1) prefix position, bare or prefix token, e.g.:
             - [NUMBER]: NUMBER.prefix() will just return the token value
-            - [MINUS, EXPRESSION]: MINUS.prefix() will evaluate the following EXPRESSION (next recursion level)
-              and return its negated result
+            - [MINUS, EXPRESSION]: the following EXPRESSION is evaluated with MINUS.prefix_bp,
+              then its result gets negated by MINUS.unary
+            - [LPAREN, EXPRESSION, RPAREN]: the following EXPRESSION is evaluated up to LPAREN.closing
 
-        2) infix method returns a value for postfix or infix token position, e.g.:
-            - [..., FACTORIAL]: FACTORIAL.infix() will  receive the result of previous computations
+        2) infix position, postfix or infix token, e.g.:
+            - [..., FACTORIAL]: FACTORIAL.infix() will receive the result of previous computations
               and return its computed factorial
-            - [..., PLUS, EXPRESSION]: PLUS.infix() will receive the result of previous computations,
-              evaluate the following EXPRESSION and return the sum
+            - [..., PLUS, EXPRESSION]: the following EXPRESSION is evaluated with PLUS.rbp,
+              then PLUS.binary receives the result of previous computations and the EXPRESSION result
+
+        This is the classic recursive Pratt parser, except that every pending operator waiting for
+        its operand to be evaluated is kept on an explicit stack of (bp, arity, symbol, left) frames
+        instead of a Python call frame, so nesting depth is only limited by memory.
         """
-        t = self.current_token
-        self.current_token = next(self.tokens_queue)
-        left = t.prefix()
-        while previous_bp < self.current_token.bp:
-            t = self.current_token
-            self.current_token = next(self.tokens_queue)
-            left = t.infix(left)
-        return left
+        lexer, kinds, values = self.lexer, self.kinds, self.values
+        classes, bps, rbps, prefix_bps, closings = (
+            lexer.classes, lexer.bps, lexer.rbps, lexer.prefix_bps, lexer.closings
+        )
+        stack = []
+
+        while True:
+            # Prefix position: push unary operators and groups until an operand comes
+            index = self.next()
+            kind = kinds[index]
+            if prefix_bps[kind] is not None:
+                stack.append((previous_bp, 1, classes[kind], None))
+                previous_bp = prefix_bps[kind]
+                continue
+            if closings[kind] is not None:
+                stack.append((previous_bp, 0, classes[kind], None))
+                previous_bp = 0
+                continue
+            left = classes[kind].prefix(self, values[index])
+
+            # Infix position: extend the left operand while it binds stronger than the context,
+            # closing the finished contexts one by one
+            while True:
+                kind = kinds[self.position]
+                if previous_bp < bps[kind]:
+                    self.next()
+                    if rbps[kind] is None:
+                        left = classes[kind].infix(self, left)
+                        continue
+                    stack.append((previous_bp, 2, classes[kind], left))
+                    previous_bp = rbps[kind]
+                    break
+
+                if not stack:
+                    return left
+
+                previous_bp, arity, symbol, first = stack.pop()
+                if arity == 2:
+                    left = self.binary(symbol, first, left)
+                elif arity == 1:
+                    left = self.unary(symbol, left)
+                else:
+                    if classes[kind].id() != symbol.closing.id():
+                        raise SyntaxError(f"Expected {symbol.closing.id()}")
+                    self.next()
 
     def parse(self, text):
-        """Parse and interpret current string, storing the result to self.result"""
+        """
+        Parse and interpret current string, storing the result to self.result.
+        With a result cache, self.key and self.entry are the cache key and entry of the text
+        """
+        with self.backend.activated():
+            self.result = None
+            self.entry = None
+            self.text = text
+            self.tokenize()
+
+            self.key = key = self.cache_key() if self.cache is not None else None
+            if key is not None:
+                self.entry = self.cache.get(key)
+                if self.entry is not None:
+                    self.variables.update(self.entry.declared)
+                    self.result = self.entry.result
+                    return
+
+            variables = set(self.variables)
+            self.result = self.expression()
+
+            if self.kinds[self.position] != self.lexer.end:
+                self.result = None
+                raise SyntaxError(f"Unexpected token {self.current_token.id()}")
+
+            if key is not None:
+                declared = {name: value for name, value in self.variables.items() if name not in variables}
+                self.entry = CacheEntry(result=self.result, declared=declared)
+                self.cache.put(key, self.entry)
+
+    def cache_key(self):
+        """
+        Key of the current text in the result cache, made of:
+        - its top level terms tokens (symbol id and lexeme), sorted in each side of the equation,
+          so that neither whitespace nor the order of terms matter
+        - the current values of the variables it refers to, as they are the input of the computation too,
+          except the unknowns an equation would declare anyway, so that repeating a declaring text hits
+        - the precision of the backend, its numbers being told apart by their symbol
+        Return None when the text cannot be cached, i.e. some of these values aren't hashable
+        """
+        classes = self.lexer.classes
+        lexemes = (self.text[start:end] for start, end in zip(self.starts, self.ends))
+        # The first term of a side is added just like the others
+        sides, side, operator = [], [], Plus.id()
+
+        for term, separator in self.terms(zip(self.kinds, lexemes)):
+            side.append((operator, tuple((classes[kind].id(), lexeme) for kind, lexeme in term)))
+            if separator == self.lexer.end or classes[separator] is Equals:
+                sides.append(tuple(sorted(side)))
+                side, operator = [], Plus.id()
+            else:
+                operator = classes[separator].id()
+
+        spellings = {}
+        for x in self.summary.names:
+            spellings.setdefault(x.lower(), set()).add(x)
+        declares = self.summary.contains(Equals)
+        variables = tuple(sorted(
+            (name, self.variables[name]) for name, names in spellings.items() if name in self.variables
+            and not (declares and len(names) == 1 and self.variables[name] == Variable(name=min(names), degree=1))
+        ))
+        key = (tuple(sides), variables, self.backend.precision)
+        try:
+            hash(key)
+        except TypeError:
+            return None
+        return key
+
+    def parse_stream(self, chunks):
+        """
+        Parse and interpret an equation coming as text chunks (e.g. read from a file),
+        storing the result to self.result.
+
+        The top level terms of the equation, separated by PLUS and MINUS in infix position or by EQUALS,
+        are interpreted one by one as they arrive and summed up into their side of the equation.
+        Polynomials combine equal monomials right away,
+        so the memory used depends on the number of distinct monomials, not on the text length.
+
+        Names get declared while the equation is still coming,
+        so the text must have an EQUALS at the top level, otherwise nothing is declared.
+        """
         self.result = None
-        self.text = text
-        self.tokenize()
-        self.current_token = next(self.tokens_queue)
-        self.result = self.expression()
+        self.entry = None
+        variables = dict(self.variables)
+        separators = {self.lexer.codes.get(x): x for x in (Plus, Minus, Equals)}
+        sides, side, operator = [], None, None
 
-        if not isinstance(self.current_token, End):
-            self.result = None
+        try:
+            for term, separator in self.terms(self.lexer.stream(chunks)):
+                value = self.parse_term(term)
+                side = value if operator is None else self.binary(operator, side, value)
+
+                if separator == self.lexer.end or separators[separator] is Equals:
+                    sides.append(side)
+                    side, operator = None, None
+                else:
+                    operator = separators[separator]
+
+            if len(sides) < 2:
+                raise SyntaxError(f"Expected {Equals.id()}")
+
+            # EQUALS is right associative: a = b = c is a = (b = c)
+            result = sides.pop()
+            while sides:
+                result = self.binary(Equals, sides.pop(), result)
+            self.result = result
+
+        except BaseException:
+            self.variables = variables
+            raise
+
+    def terms(self, tokens):
+        """
+        Split (kind, lexeme, value) tokens ended by the End symbol into the top level terms of an equation.
+        Generate (term, separator) pairs: the list of the term tokens and the kind of the token following it,
+        i.e. PLUS or MINUS in infix position, EQUALS, or END.
+        """
+        lexer = self.lexer
+        separators = {lexer.codes.get(x) for x in (Plus, Minus, Equals)}
+        term, depth, infix = [], 0, False
+
+        for token in tokens:
+            kind = token[0]
+            if kind != lexer.end and not (infix and depth == 0 and kind in separators):
+                term.append(token)
+                depth += lexer.nesting[kind]
+                infix = not lexer.operators[kind] or lexer.nesting[kind] < 0
+                continue
+
+            yield term, kind
+            term, infix = [], False
+
+    def parse_term(self, tokens):
+        """Parse and interpret a term of a streamed equation given as a list of streamed tokens"""
+        self.text, (self.kinds, self.starts, self.ends, self.values, summary) = self.lexer.assemble(tokens)
+        # The term is a part of an equation
+        self.summary = summary._replace(symbols=summary.symbols | {Equals})
+        self.position = 0
+        value = self.expression()
+
+        if self.kinds[self.position] != self.lexer.end:
             raise SyntaxError(f"Unexpected token {self.current_token.id()}")
+        return value
+
+    def compile(self, text):
+        """Compile the text into a reusable parser.compiler.Expression computing with the backend, cached by text"""
+        from parser.compiler import compile_text
+
+        return compile_text(self.lexer.symbols, text, self.backend)
 
-    def run(self, s=None, interactive=True):
-        """Run the interpreter with user input and error handling"""
+    def execute(self, s=None, chunks=None):
+        """
+        Interpret the input with error handling, the input may also be given as text chunks of an equation,
+        see parse_stream. Return the text to show: the result or the error message
+        """
+        try:
+            with self.backend.activated():
+                if chunks is not None:
+                    self.parse_stream(chunks)
+                else:
+                    self.parse(s)
+
+                if self.entry is not None and self.entry.output is not None:
+                    return self.entry.output
+                output = self.result.solution_text if isinstance(self.result, Polynomial) else f"{self.result}"
+                if self.entry is not None:
+                    self.entry.output = output
+                    self.cache.put(self.key, self.entry)
+                return output
+
+        except (MathError, ResolveError, ZeroDivisionError) as e:
+            return f"Could not compute: {e}"
+        except TypeError:
+            return "Could not compute: unsupported operation"
+        except SyntaxError as e:
+            return f"You have an error in your syntax: {e}"
+        except StopIteration:
+            return "Could not parse: unexpected end of expression. Did you forget something?"
+        except Exception:
+            return "Could not deal with it, please check your syntax"
+
+    def run(self, s=None, interactive=True, chunks=None):
+        """Run the interpreter with user input"""
         while True:
             try:
                 if interactive:
@@ -114,22 +364,11 @@ class Computor:
                     if not s:
                         continue
 
-                self.parse(s)
-                print(self.result.solution_text if isinstance(self.result, Polynomial) else self.result)
-
-            except (MathError, ResolveError, ZeroDivisionError) as e:
-                print(f"Could not compute: {e}")
-            except TypeError:
-                print("Could not compute: unsupported operation")
-            except SyntaxError as e:
-                print(f"You have an error in your syntax: {e}")
-            except StopIteration:
-                print("Could not parse: unexpected end of expression. Did you forget something?")
+                print(self.execute(s, chunks))
+
             except (EOFError, KeyboardInterrupt):
                 print("\nBye!")
                 break
-            except Exception:
-                print("Could not deal with it, please check your syntax")
             finally:
                 if not interactive:
                     break
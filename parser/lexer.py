@@ -0,0 +1,196 @@
+"""
+Compiled tokenizers for symbol sets
+"""
+import re
+from array import array
+from collections import namedtuple
+from functools import lru_cache
+
+from parser.symbols import End, Name, Operator
+
+# Number of cleared literal values a stream keeps for reuse
+STREAM_CLEARED = 4096
+
+
+class Summary(namedtuple('Summary', ['symbols', 'first', 'names', 'depth'])):
+    """
+    Structural facts about a text, recorded once while tokenizing.
+
+    For the 'x^2 = (x + y)' text there will be following data structure:
+
+    symbols: frozenset({Name, Power, Number, Equals, LParen, Plus, RParen, End})
+    first: {Name: 0, Power: 1, Number: 2, Equals: 3, LParen: 4, Plus: 6, RParen: 8, End: 9}
+    names: frozenset({'x', 'y'})
+    depth: 1
+
+    first maps every symbol found to the index of its first token, e.g. the position of Equals,
+    depth is the maximum nesting level of groups.
+    """
+
+    def contains(self, symbol):
+        return symbol in self.symbols
+
+
+class Tokens(namedtuple('Tokens', ['kinds', 'starts', 'ends', 'values', 'summary'])):
+    """
+    Compact token stream: parallel arrays instead of one symbol instance per token.
+
+    For the 'x + 25' text there will be following data structure:
+
+    kinds: array('B', [NAME, PLUS, NUMBER, END])  (indexes in Lexer.classes)
+    starts: array('L', [0, 2, 4, 6])
+    ends: array('L', [1, 3, 6, 6])
+    values: ['x', None, Real(25), None]
+    summary: Summary(...)
+
+    Literal values are cleared once per distinct lexeme, so repeated numbers and names share their value.
+    """
+
+
+class Lexer:
+    """
+    Tokenizer compiled once for a given tuple of symbol classes.
+
+    The regex will be like r'\\s*(?P<NAME>[a-zA-Z]+)|(?P<NUMBER>(?:[0-9\\.]+i?)|i)|(?P<PLUS>\\+)|(?P<MINUS>-)'
+    and the dispatch table maps each of its group names to the kind code of the matched symbol.
+
+    Use Lexer.compile(symbols) to get an instance: lexers are cached by symbol set,
+    so all computors built with the same symbols share a single compiled regex.
+    """
+    def __init__(self, symbols):
+        self.symbols = tuple(symbols)
+        self.regex = re.compile(r'\s*' + r'|'.join([f'(?P<{x.id()}>{x.pattern})' for x in self.symbols]))
+
+        # Kind codes are indexes in self.classes, the End symbol always comes last
+        self.classes = self.symbols + (End,)
+        self.codes = {x: code for code, x in enumerate(self.classes)}
+        self.end = self.codes[End]
+        self.bps = tuple(x.bp for x in self.classes)
+        self.rbps = tuple(x.rbp for x in self.classes)
+        self.prefix_bps = tuple(x.prefix_bp for x in self.classes)
+        self.closings = tuple(x.closing for x in self.classes)
+        self.operators = tuple(issubclass(x, Operator) for x in self.classes)
+        self.names = tuple(issubclass(x, Name) for x in self.classes)
+        # Nesting level change for group opening and closing symbols
+        self.nesting = tuple(
+            (1 if x.closing is not None else 0) - (1 if any(y.closing is x for y in self.classes) else 0)
+            for x in self.classes
+        )
+        self.dispatch = {x.id(): self.codes[x] for x in self.symbols}
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def compile(cls, symbols):
+        return cls(symbols)
+
+    def tokenize(self, parser, text):
+        """Return the list of symbol instances found in the text"""
+        return [self.classes[self.dispatch[match.lastgroup]](parser, match.group(match.lastgroup))
+                for match in self.regex.finditer(text)]
+
+    def scan(self, text):
+        """Return the compact Tokens arrays for the text, ended by the End symbol, and their Summary"""
+        kinds, starts, ends, values = array('B'), array('L'), array('L'), []
+        classes, dispatch, operators, nesting = self.classes, self.dispatch, self.operators, self.nesting
+        cleared = {}
+        depth = max_depth = 0
+
+        for match in self.regex.finditer(text):
+            group = match.lastgroup
+            kind = dispatch[group]
+            start, end = match.span(group)
+            kinds.append(kind)
+            starts.append(start)
+            ends.append(end)
+
+            if operators[kind]:
+                values.append(None)
+                if nesting[kind]:
+                    depth += nesting[kind]
+                    max_depth = max(depth, max_depth)
+                continue
+
+            lexeme = text[start:end]
+            key = (kind, lexeme)
+            if key not in cleared:
+                cleared[key] = classes[kind].clear(lexeme)
+            values.append(cleared[key])
+
+        kinds.append(self.end)
+        starts.append(len(text))
+        ends.append(len(text))
+        values.append(None)
+
+        summary = Summary(
+            symbols=frozenset(classes[kind] for kind in set(kinds)),
+            first={classes[kind]: kinds.index(kind) for kind in set(kinds)},
+            names=frozenset(lexeme for kind, lexeme in cleared if self.names[kind]),
+            depth=max_depth,
+        )
+        return Tokens(kinds, starts, ends, values, summary)
+
+    def stream(self, chunks):
+        """
+        Generate (kind, lexeme, value) tokens from an iterable of text chunks, ended by the End symbol.
+        The last token of a chunk may go on in the next one, so it is held back until the next chunk comes.
+        """
+        classes, dispatch, operators = self.classes, self.dispatch, self.operators
+        cleared = {}
+        buffer = ''
+
+        def token(match):
+            kind = dispatch[match.lastgroup]
+            lexeme = match.group(match.lastgroup)
+            if operators[kind]:
+                return kind, lexeme, None
+
+            key = (kind, lexeme)
+            if key not in cleared:
+                if len(cleared) >= STREAM_CLEARED:
+                    cleared.clear()
+                cleared[key] = classes[kind].clear(lexeme)
+            return kind, lexeme, cleared[key]
+
+        for chunk in chunks:
+            buffer += chunk
+            matches = list(self.regex.finditer(buffer))
+            for match in matches[:-1]:
+                yield token(match)
+            buffer = buffer[matches[-1].start():] if matches else ''
+
+        for match in self.regex.finditer(buffer):
+            yield token(match)
+        yield self.end, '', None
+
+    def assemble(self, tokens):
+        """
+        Return the text and the compact Tokens of a list of streamed tokens, ended by the End symbol.
+        The text is rebuilt by joining the lexemes with spaces.
+        """
+        kinds, starts, ends, values = array('B'), array('L'), array('L'), []
+        offset = 0
+        for kind, lexeme, value in tokens:
+            kinds.append(kind)
+            starts.append(offset)
+            ends.append(offset + len(lexeme))
+            values.append(value)
+            offset += len(lexeme) + 1
+
+        text = ' '.join(lexeme for _, lexeme, _ in tokens)
+        kinds.append(self.end)
+        starts.append(len(text))
+        ends.append(len(text))
+        values.append(None)
+
+        depth = max_depth = 0
+        for kind in kinds:
+            depth += self.nesting[kind]
+            max_depth = max(depth, max_depth)
+
+        summary = Summary(
+            symbols=frozenset(self.classes[kind] for kind in set(kinds)),
+            first={self.classes[kind]: kinds.index(kind) for kind in set(kinds)},
+            names=frozenset(value for kind, value in zip(kinds, values) if self.names[kind]),
+            depth=max_depth,
+        )
+        return text, Tokens(kinds, starts, ends, values, summary)
@@ -2,9 +2,29 @@
 Symbol classes incorporating grammar and semantics.
 
 bp: binding power
-prefix: value returned when the symbol isn't left preceded (in bare or prefix position, e.g. x, -5)
-infix: value returned when the symbol is left preceded (in infix or suffix position, e.g. 5 - 2, x!)
+clear: converts the token text to its value once, at tokenizing time
+
+The grammar of operators is declared, so that the parser can handle any nesting with its own stack:
+rbp: binding power of the right operand, for binary operators (e.g. 5 - 2)
+prefix_bp: binding power of the operand, for unary operators in prefix position (e.g. -5)
+closing: symbol closing the group, for grouping operators (e.g. (5))
+
+Other symbols get interpreted by their class methods, receiving the parser:
+prefix: value returned when the symbol isn't left preceded (in bare or prefix position, e.g. x)
+infix: value returned when the symbol is left preceded (in infix or suffix position, e.g. x!)
+These must not parse further tokens themselves.
+
+Parsers don't keep symbol instances around, symbols are only instantiated
+when a single token has to be shown, e.g. in error messages.
+
+The computing itself goes through parser hooks (parser.literal, parser.unary, parser.binary)
+calling back the symbol semantics: evaluate for literals, unary and binary for operators.
+This way the same grammar either computes values right away (parser.computor.Computor)
+or compiles reusable code (parser.compiler.Compiler).
 """
+from functools import lru_cache
+
+from mathematics.backends import DECIMAL, EXACT, FLOAT
 from mathematics.constants import CONSTANTS
 from mathematics.matrix import Matrix
 from mathematics.numbers import Real, Complex
@@ -16,56 +36,66 @@ class Symbol:
     """Parent class for all symbols"""
     pattern = None
     bp = 0
+    rbp = None
+    prefix_bp = None
+    closing = None
+
+    def __init__(self, parser, value):
+        self.parser = parser
+        self.value = self.clear(value)
 
     @classmethod
     def id(cls):
         return cls.__name__.upper()
 
-    def prefix(self):
-        raise SyntaxError(f"{self.id()} symbol does not support prefix position")
+    @classmethod
+    def clear(cls, value):
+        return value
 
-    def infix(self, left):
-        raise SyntaxError(f"{self.id()} symbol does not support infix position")
+    @classmethod
+    def prefix(cls, parser, value):
+        raise SyntaxError(f"{cls.id()} symbol does not support prefix position")
+
+    @classmethod
+    def infix(cls, parser, left):
+        raise SyntaxError(f"{cls.id()} symbol does not support infix position")
+
+    def __repr__(self):
+        return f"({self.id()} {self.value})"
 
 
 # Literals
 
 class Literal(Symbol):
-    def __init__(self, parser, value):
-        self.parser = parser
-        self.value = self.clear(value)
+    @classmethod
+    def prefix(cls, parser, value):
+        return parser.literal(cls, value)
 
-    def clear(self, value):
+    @classmethod
+    def evaluate(cls, scope, value):
         return value
 
-    def prefix(self):
-        return self.value
-
-    def __repr__(self):
-        return f"({self.id()} {self.value})"
-
 
 class Name(Literal):
     pattern = r'[a-zA-Z]+'
 
-    def prefix(self):
-        if self.value.lower() in self.parser.variables:
-            return self.parser.variables[self.value.lower()]
-        elif any(isinstance(x, Equals) for x in self.parser.tokens):
-            variable = Variable(name=self.value, degree=1)
-            self.parser.variables[self.value.lower()] = variable
+    @classmethod
+    def evaluate(cls, scope, value):
+        if value.lower() in scope.variables:
+            return scope.variables[value.lower()]
+        elif scope.contains(Equals):
+            variable = Variable(name=value, degree=1)
+            scope.variables[value.lower()] = variable
             return variable
 
-        raise ResolveError(f"Variable {self.value} is not defined")
-
-    def infix(self, left):
-        return self.prefix()
+        raise ResolveError(f"Variable {value} is not defined")
 
 
 class FunctionName(Literal):
     pattern = r'[a-zA-Z]+\('
 
-    def prefix(self):
+    @classmethod
+    def evaluate(cls, scope, value):
         # TODO: Interpreting
         # get value from the parentheses
         # next token == rparen or throw
@@ -80,24 +110,51 @@ class FunctionName(Literal):
         # all the rest = polynomial (or expression? or ast? or as lambda?)
         # ensure that there is only one variable == function variable
         # store the polynomial
-        if self.value in self.parser.functions:
-            return self.parser.variables[self.value]
-        elif any(isinstance(x, Equals) for x in self.parser.tokens):
-            return Variable(name=self.value, degree=1)
+        if value in scope.functions:
+            return scope.variables[value]
+        elif scope.contains(Equals):
+            return Variable(name=value, degree=1)
 
-        raise ResolveError(f"Variable {self.value} is not defined")
+        raise ResolveError(f"Variable {value} is not defined")
 
 
 class Number(Literal):
+    """
+    Number cleared as a real number of its numeric backend, see mathematics.backends.
+    Cleared values are shared by all texts, as they are immutable
+    """
     pattern = r'(?:[0-9\.]+i?)|i'
+    backend = FLOAT
 
-    def clear(self, value):
+    @classmethod
+    @lru_cache(maxsize=4096)
+    def clear(cls, value):
         try:
-            return Complex(real=0, imag=value.replace('i', '')) if 'i' in value else Real(value)
-        except ValueError:
+            if 'i' in value:
+                return Complex(real=0, imag=cls.backend.convert(value.replace('i', '')))
+            return Real(cls.backend.convert(value))
+        except (ValueError, ArithmeticError):
             raise SyntaxError(f"Wrong number: {value}")
 
 
+class DecimalNumber(Number):
+    """Number cleared as a decimal, computed with the precision of the computor backend"""
+    backend = DECIMAL
+
+
+class ExactNumber(Number):
+    """Number cleared as an exact fraction, e.g. 0.1 is 1/10, so that computations with it stay exact"""
+    backend = EXACT
+
+
+NUMBERS = {x.backend.name: x for x in (Number, DecimalNumber, ExactNumber)}
+
+
+def numbers(symbols, backend):
+    """Return the symbols with numbers cleared by the given backend"""
+    return tuple(NUMBERS[backend.name] if issubclass(x, Number) else x for x in symbols)
+
+
 class Constant(Literal):
     pattern = r'|'.join(CONSTANTS.keys())
 
@@ -109,125 +166,106 @@ class Needle(Literal):
 # Operators
 
 class Operator(Symbol):
-    def __init__(self, parser, _value):
-        self.parser = parser
-        self.first = None
-        self.second = None
-        self.value = None
-
-    def __repr__(self):
-        return f"({self.id()} {self.first} {self.second})"
+    pass
 
 
 class Plus(Operator):
     pattern = r'\+'
     bp = 10
+    rbp = 10
+    prefix_bp = 100
 
-    def prefix(self):
-        self.first = self.parser.expression(100)
-        self.second = None
-        self.value = self.first
-        return self.value
+    @staticmethod
+    def unary(operand):
+        return operand
 
-    def infix(self, left):
-        self.first = left
-        self.second = self.parser.expression(self.bp)
-        self.value = self.first + self.second
-        return self.value
+    @staticmethod
+    def binary(first, second):
+        return first + second
 
 
 class Minus(Operator):
     pattern = r'-'
     bp = 10
+    rbp = 10
+    prefix_bp = 100
 
-    def prefix(self):
-        self.first = -self.parser.expression(100)
-        self.second = None
-        self.value = self.first
-        return self.value
+    @staticmethod
+    def unary(operand):
+        return -operand
 
-    def infix(self, left):
-        self.first = left
-        self.second = self.parser.expression(self.bp)
-        self.value = self.first - self.second
-        return self.value
+    @staticmethod
+    def binary(first, second):
+        return first - second
 
 
 class Times(Operator):
     pattern = r'\*'
     bp = 20
+    rbp = 20
 
-    def infix(self, left):
-        self.first = left
-        self.second = self.parser.expression(self.bp)
-        self.value = self.first * self.second
-        return self.value
+    @staticmethod
+    def binary(first, second):
+        return first * second
 
 
 class TimesMatrix(Operator):
     pattern = r'\*\*'
     bp = 20
+    rbp = 20
 
-    def infix(self, left):
-        self.first = left
-        self.second = self.parser.expression(self.bp)
-        self.value = self.first * self.second
-        return self.value
+    @staticmethod
+    def binary(first, second):
+        return first * second
 
 
 class Divide(Operator):
     pattern = r'/'
     bp = 20
+    rbp = 20
 
-    def infix(self, left):
-        self.first = left
-        self.second = self.parser.expression(self.bp)
-        self.value = self.first / self.second
-        return self.value
+    @staticmethod
+    def binary(first, second):
+        return first / second
 
 
 class Modulo(Operator):
     pattern = r'%'
     bp = 20
+    rbp = 20
 
-    def infix(self, left):
-        self.first = left
-        self.second = self.parser.expression(self.bp)
-        self.value = self.first % self.second
-        return self.value
+    @staticmethod
+    def binary(first, second):
+        return first % second
 
 
 class Power(Operator):
     pattern = r'\^'
     bp = 30
+    rbp = 25
 
-    def infix(self, left):
-        self.first = left
-        self.second = self.parser.expression(25)
-        self.value = self.first ** self.second
-        return self.value
-
-
-class LParen(Operator):
-    pattern = r'\('
-
-    def prefix(self):
-        return self.parser.advance(RParen)
+    @staticmethod
+    def binary(first, second):
+        return first ** second
 
 
 class RParen(Operator):
     pattern = r'\)'
 
 
+class LParen(Operator):
+    pattern = r'\('
+    closing = RParen
+
+
 class Equals(Operator):
     pattern = r'\='
     bp = 1
+    rbp = 0
 
-    def infix(self, left):
-        self.first = left
-        self.second = self.parser.expression()
-        self.value = Polynomial(self.first) - Polynomial(self.second)
-        return self.value
+    @staticmethod
+    def binary(first, second):
+        return Polynomial(first) - Polynomial(second)
 
 
 # Catch all other things
@@ -235,7 +273,8 @@ class Equals(Operator):
 class UndefinedToken(Symbol):
     pattern = r'[^\s]+'
 
-    def __init__(self, parser, value):
+    @classmethod
+    def clear(cls, value):
         raise SyntaxError(f"Unknown token {value}")
 
 
@@ -1,10 +1,31 @@
 #!/usr/bin/env python
 
+import os
+import pickle
+import tempfile
 import unittest
+from array import array
+from decimal import Decimal
+from fractions import Fraction
+from math import prod
+from random import Random
 
 from computor_v1 import symbols
-from mathematics.polynomial import Polynomial
+from mathematics import DEFAULT_ERROR, bisection, illinois
+from mathematics.algo import next_float
+from mathematics.backends import EXACT, decimal
+from mathematics.convolution import convolve, karatsuba, kronecker, schoolbook
+from mathematics.exceptions import MathError
+from mathematics.numbers import I, MINUS_ONE, ONE, ZERO, Complex, Real
+from mathematics.polynomial import Polynomial, Term, Variable, solve_quadratics
+from mathematics.roots import complex_sqrt, iroot, iterations, root, sqrt
+from mathematics.rational import (
+    divisors, exact_roots, factorize, is_probable_prime, is_square_free, rational_roots, square_free,
+)
+from mathematics.solvers import aberth, modulus, newton_step
+from parser.batch import run_batch
 from parser.computor import Computor
+from parser.exceptions import ResolveError
 
 
 DEGREE = "Polynomial degree: {}"
@@ -16,7 +37,7 @@ D_NONE = "The solution is:"
 ALL_NUMBERS = "All real numbers are solutions"
 NO_SOLUTION = "This equation has no solutions in our world"
 
-ERROR_BIG_DEGREE = "The polynomial degree is strictly greater than 2, I can't solve."
+D_MANY = "The solutions are:"
 ERROR_NON_NATURAL_DEGREE = "Cannot solve polynomials with non-natural degrees"
 
 
@@ -134,7 +155,26 @@ class TestComputor(unittest.TestCase):
                 'messages': [
                     REDUCED.format('5 - 6 * X - 5.6 * X^3 = 0'),
                     DEGREE.format(3),
-                    ERROR_BIG_DEGREE,
+                    D_MANY,
+                    '0.615598\n-0.307799 - 1.16432i\n-0.307799 + 1.16432i',
+                ]
+            },
+            {
+                'input': 'X^4 = 16',
+                'messages': [
+                    REDUCED.format('-16 + X^4 = 0'),
+                    DEGREE.format(4),
+                    D_MANY,
+                    '-2\n2\n-2i\n+2i',
+                ]
+            },
+            {
+                'input': 'X^5 - X = 1',
+                'messages': [
+                    REDUCED.format('-1 - X + X^5 = 0'),
+                    DEGREE.format(5),
+                    D_MANY,
+                    '1.1673\n-0.764884 - 0.352472i\n-0.764884 + 0.352472i\n0.181232 - 1.08395i\n0.181232 + 1.08395i',
                 ]
             },
         ]
@@ -268,8 +308,8 @@ class TestComputor(unittest.TestCase):
                     REDUCED.format('0.666667 * x - 0.1 * x^2 = 0'),
                     DEGREE.format(2),
                     D_POSITIVE,
-                    '1.11111',
-                    '5.55556',
+                    '0',
+                    '6.66667',
                 ]
             },
         ]
@@ -322,6 +362,529 @@ class TestComputor(unittest.TestCase):
         ]
         self.run_tests(tests)
 
+    # Machine generated input
+
+    def test_deep_nesting(self):
+        depth = 10000
+        tests = [
+            {'input': '(' * depth + 'x' + ')' * depth + ' = 2', 'messages': [D_NONE, '2']},
+            {'input': '-' * depth + '2 = x', 'messages': [D_NONE, '2']},
+            {'input': 'x = 2' + '^1' * depth, 'messages': [D_NONE, '2']},
+            {'input': '(' * depth + 'x = 2', 'messages': ['None']},
+        ]
+        self.run_tests(tests)
+
+
+class TestNumbers(unittest.TestCase):
+    def test_arithmetic(self):
+        a, z = Real(3), Complex(real=1, imag=2)
+        for result, expected in [(a + 0.5, 3.5), (1 - a, -2), (-z, Complex(real=-1, imag=-2)), (a / 2, 1.5),
+                                 (3 / z, Complex(real=0.6, imag=-1.2)), (z / Real(2), Complex(real=0.5, imag=1)),
+                                 (z * z, Complex(real=-3, imag=4)), (a * 2.0, 6), (I * I, MINUS_ONE)]:
+            with self.subTest(expected=expected):
+                self.assertEqual(result, expected)
+        # Integral floats are stored as ints
+        self.assertIsInstance((Real(1.5) * 2).real, int)
+        self.assertIsInstance((z - z).imag, int)
+        self.assertFalse(hasattr(a, '__dict__'))
+
+    def test_power(self):
+        self.assertEqual((Real(2) ** 5000).real, 2 ** 5000)
+        self.assertEqual(f"{Real(2) ** 5000}", "1.41247e+1505")
+        self.assertEqual(Real(2) ** -3, 0.125)
+        self.assertEqual(Complex(real=1, imag=1) ** 8, 16)
+        self.assertEqual(Complex(real=1, imag=1) ** -2, Complex(imag=-0.5))
+        for number, power in [(Real(2), 2 ** 30), (Real(1.5), 5000), (Complex(real=1, imag=1), 10 ** 8)]:
+            with self.assertRaises(MathError):
+                number ** power
+        with self.assertRaises(ZeroDivisionError):
+            Real(0) ** -1
+
+    def test_modular_power(self):
+        self.assertEqual(pow(Real(3), 10 ** 18, 1000000007), pow(3, 10 ** 18, 1000000007))
+        self.assertEqual(pow(Real(3), -1, 7), 5)
+        self.assertEqual(pow(Complex(real=1, imag=1), 8, 5), 1)
+        self.assertEqual(pow(Complex(real=2, imag=3), 3, 100), Complex(real=54, imag=9))
+        with self.assertRaises(MathError):
+            pow(Real(2.5), 2, 7)
+
+
+class TestRoots(unittest.TestCase):
+    def test_exact(self):
+        for n, degree, expected in [(4, 2, 2), (10 ** 40, 2, 10 ** 20), (27, 3, 3), (0.25, 2, 0.5),
+                                    (2 ** 5000, 2, 2 ** 2500)]:
+            with self.subTest(n=n, degree=degree):
+                self.assertEqual(root(n, degree), expected)
+        self.assertEqual(iroot(2 ** 61 - 1), 1518500249)
+
+    def test_approximate(self):
+        for n in [2, 0.36, 1e-300, 12345.678, 1e300]:
+            with self.subTest(n=n):
+                self.assertAlmostEqual(sqrt(n) / n ** 0.5, 1, places=15)
+        self.assertAlmostEqual(root(2, 3), 1.2599210498948732, places=15)
+
+    def test_complex(self):
+        for real, imag, expected in [(-4, 0, (0, 2)), (3, 4, (2, 1)), (-3, -4, (1, -2)), (-1, 1e-20, (5e-21, 1))]:
+            with self.subTest(real=real, imag=imag):
+                self.assertEqual(complex_sqrt(real, imag), expected)
+        self.assertEqual(Complex(real=-3, imag=4) ** 0.5, Complex(real=1, imag=2))
+        cube = Complex(-8) ** (1 / 3)
+        self.assertAlmostEqual(cube.real, 1)
+        self.assertAlmostEqual(cube.imag, 3 ** 0.5)
+
+    def test_iterations(self):
+        before = iterations['newton']
+        sqrt(2)
+        self.assertLess(iterations['newton'] - before, 10)
+
+
+class TestBackends(unittest.TestCase):
+    def test_exact(self):
+        computor = Computor(backend=EXACT)
+        for text, expected in [('x = 0.1 + 0.2 - 0.3', f"{REDUCED.format('x = 0')}\n{DEGREE.format(1)}\n{D_NONE}\n0"),
+                               ('x^2 = 0.25',
+                                f"{REDUCED.format('-0.25 + x^2 = 0')}\n{DEGREE.format(2)}\n{D_POSITIVE}\n0.5\n-0.5"),
+                               ('1/3 * x = 1',
+                                f"{REDUCED.format('-1 + 0.333333 * x = 0')}\n{DEGREE.format(1)}\n{D_NONE}\n3")]:
+            with self.subTest(text=text):
+                self.assertEqual(computor.execute(text), expected)
+
+        computor.parse('(x/3 + 0.5i)^2 = 0')
+        self.assertEqual(computor.result.monomials, {
+            (0,): Complex(real=Fraction(-1, 4)), (1,): Complex(imag=Fraction(1, 3)), (2,): Fraction(1, 9)
+        })
+        x1, x2 = computor.result.resolve()
+        self.assertEqual((x1, x2), (Complex(imag=Fraction(-3, 2)), Complex(imag=Fraction(-3, 2))))
+        self.assertIsInstance(x1.imag, Fraction)
+
+    def test_decimal(self):
+        computor = Computor(backend=decimal(30))
+        for text, expected in [('1/3', '0.333333333333333333333333333333'), ('0.1 + 0.2 - 0.3', '0'), ('2 * 5', '10'),
+                               ('2 ^ 3 ^ -1', '1.25992104989487316476721060728'),
+                               ('x^2 = 2', f"{REDUCED.format('-2 + x^2 = 0')}\n{DEGREE.format(2)}\n{D_POSITIVE}\n"
+                                           "1.41421356237309504880168872421\n-1.41421356237309504880168872421")]:
+            with self.subTest(text=text):
+                self.assertEqual(computor.execute(text), expected)
+        self.assertEqual(Computor(backend=decimal(10)).execute('1/3'), '0.3333333333')
+        # Degrees above 4 too, the numeric roots being polished
+        computor.parse('x^5 - x = 1')
+        with computor.backend.activated():
+            for x in computor.result.resolve():
+                self.assertIsInstance(x.real, Decimal)
+                self.assertLess(modulus(x ** 5 - x - 1), Decimal('1e-56'))
+        # Other computors are not affected
+        self.assertEqual(Computor().execute('1/3'), '0.333333')
+
+    def test_bisection(self):
+        with decimal(30).activated():
+            root = bisection(lambda x: x * x - 2, Decimal(0), Decimal(2))
+            self.assertEqual(f"{root}", '1.41421356237309504880168872421')
+        self.assertAlmostEqual(bisection(lambda x: x * x - 2, 0, 2), 2 ** 0.5, places=6)
+
+    def test_illinois(self):
+        calls = []
+
+        def fn(x):
+            calls.append(x)
+            return x * x * x - 2 * x - 5
+
+        self.assertAlmostEqual(illinois(fn, 3, 2, 1e-15), 2.0945514815423265, places=15)
+        self.assertLess(len(calls), 20)
+        with decimal(30).activated():
+            root = illinois(lambda x: x * x - 2, Decimal(0), Decimal(2))
+            self.assertLess(abs(root - Decimal(2).sqrt()), Decimal('1e-28'))
+        # Values too far apart for the false position
+        self.assertAlmostEqual(illinois(lambda x: x ** 99 - 1e-300, -10.0, 10.0), 1e-300 ** (1 / 99), places=12)
+        self.assertRaises(MathError, illinois, fn, 0, 1)
+
+    def test_next_float(self):
+        for x, y, expected in [(1.0, 2, 1 + 2 ** -52), (1.0, 0, 1 - 2 ** -53), (-1.0, -2, -1 - 2 ** -52),
+                               (0.0, -1, -5e-324), (5e-324, 1, 1e-323), (3.0, 3.0, 3.0)]:
+            with self.subTest(x=x, y=y):
+                self.assertEqual(next_float(x, y), expected)
+
+    def test_roots(self):
+        self.assertEqual(root(Fraction(4, 9)), Fraction(2, 3))
+        self.assertEqual(complex_sqrt(Fraction(-3, 4), Fraction(1)), (Fraction(1, 2), Fraction(1)))
+        self.assertAlmostEqual(root(Fraction(1, 2)), 0.5 ** 0.5)
+
+
+class PolynomialFixture:
+    """Parses the equations into polynomials, for the polynomial test cases"""
+
+    def setUp(self):
+        self.computor = Computor(symbols=symbols)
+
+    def polynomial(self, s):
+        self.computor.variables = {}
+        self.computor.parse(s)
+        return self.computor.result
+
+
+class TestPolynomial(PolynomialFixture, unittest.TestCase):
+    def test_closed_forms(self):
+        random = Random(3)
+        for _ in range(200):
+            degree = random.choice([3, 4])
+            roots = set()
+            while len(roots) < degree:
+                real, imag = random.randint(-9, 9) / random.choice([1, 2, 4]), random.choice([0, random.randint(-5, 5)])
+                roots.add(complex(real, imag))
+            polynomial = self.polynomial(' * '.join(f'(x - ({x.real} + {x.imag}i))' for x in roots) + ' = 0')
+            found = [complex(x.real, x.imag) for x in polynomial.resolve()]
+            with self.subTest(roots=roots):
+                for x in roots:
+                    self.assertLess(min(abs(x - y) for y in found), DEFAULT_ERROR)
+
+        for text, expected in [('(x - 1)^3 = 0', (1, 1, 1)), ('(x - 1)^2 * (x + 2)^2 = 0', (-2, -2, 1, 1)),
+                               ('x^3 = 8', (2, Complex(real=-1, imag=-3 ** 0.5), Complex(real=-1, imag=3 ** 0.5)))]:
+            with self.subTest(text=text):
+                for x, y in zip(self.polynomial(text).resolve(), expected):
+                    self.assertAlmostEqual(complex(x.real, x.imag), complex(Complex(y).real, Complex(y).imag))
+
+    def test_exact_roots(self):
+        for text, expected in [('(x + 1)^10 = 0', [-1] * 10),
+                               ('6 * x^3 - 11 * x^2 + 6 * x = 1', [Fraction(1, 3), Fraction(1, 2), 1]),
+                               ('x^2 * (2 * x - 3)^3 * (x^2 + 1) = 0', [0, 0] + [Fraction(3, 2)] * 3 + [-I, I])]:
+            with self.subTest(text=text):
+                self.assertEqual(list(self.polynomial(text).resolve()), expected)
+
+        # Only the factor without rational roots is solved numerically, each root as many times as the factor
+        roots = self.polynomial('(x - 2)^2 * (x^5 - x - 1)^2 = 0').resolve()
+        self.assertEqual(roots[:2], (1.1673039782614187, 1.1673039782614187))
+        self.assertEqual(roots[2:4], (2, 2))
+        self.assertEqual(len(roots), 12)
+
+        backend = decimal(30)
+        self.computor = Computor(symbols=symbols, backend=backend)
+        with backend.activated():
+            self.assertEqual(self.polynomial('3 * x^3 = x^2').resolve(), (0, 0, Decimal(1) / 3))
+            self.assertEqual(str(self.polynomial('3 * x^3 = x^2').resolve()[2].real), '0.' + '3' * 30)
+
+    def test_sturm(self):
+        polynomial = self.polynomial('x * (x^5 - x - 1) * (x^2 - 2)^2 = 0')
+        self.assertEqual(polynomial.count_real_roots(), 4)
+        self.assertEqual(polynomial.count_real_roots(0, 2), 2)
+        self.assertEqual(polynomial.count_real_roots(-1, 0), 1)
+        self.assertEqual(polynomial.isolate_real_roots(1, 2), ((1, Fraction(5, 4)), (Fraction(5, 4), Fraction(3, 2))))
+        roots = polynomial.real_roots()
+        self.assertEqual(roots[1], 0)
+        for x, y in zip(roots, (-2 ** 0.5, 0, 1.1673039782614187, 2 ** 0.5)):
+            self.assertAlmostEqual(x, y, places=12)
+
+        # Float coefficients are exact binary fractions
+        roots = self.polynomial('5.6 * x^3 + 6 * x = 5').real_roots(precision=1e-12)
+        self.assertAlmostEqual(roots[0], 0.6155981297369639, places=12)
+        random = Random(7)
+        for degree in [5, 20, 60]:
+            terms = ' + '.join(f'{random.randint(-9, 9)} * x^{k}' for k in range(degree))
+            polynomial = self.polynomial(f'{terms} + x^{degree} = 0')
+            expected = sorted(x.real for x in polynomial.resolve() if not x.imag)
+            with self.subTest(degree=degree):
+                self.assertEqual(polynomial.count_real_roots(), len(expected))
+                for x, y in zip(polynomial.real_roots(), expected):
+                    self.assertAlmostEqual(x, y, places=9)
+
+        for text in ['x * y = 1', '5 = 5', '1i * x^3 = 1']:
+            with self.subTest(text=text):
+                with self.assertRaises(ResolveError):
+                    self.polynomial(text).count_real_roots()
+
+    def test_solve_quadratics(self):
+        random = Random(9)
+        rows = [(random.choice([-3, -1, 1, 2, 5]), random.randint(-9, 9), random.randint(-9, 9)) for _ in range(100)]
+        rows += [(1, -6, 9), (4, 4, 1), (-1, 0, -1), (0.1, 0.3, 0.2)]
+        a, b, c = (array('d', column) for column in zip(*rows))
+        solutions = solve_quadratics(a, b, c)
+        self.assertEqual(len(solutions.x1), len(rows))
+        for (a, b, c), discriminant, x1, x2 in zip(rows, *solutions):
+            polynomial = self.polynomial(f'{a} * x^2 + {b} * x + {c} = 0')
+            with self.subTest(equation=(a, b, c)):
+                self.assertEqual((discriminant > 0, discriminant == 0), (polynomial.D > 0, polynomial.D == 0))
+                for x, y in zip((x1, x2), polynomial.resolve()):
+                    self.assertAlmostEqual(x, complex(y.real, y.imag), places=9)
+
+        # No cancellation for the small root, linear equations
+        solutions = solve_quadratics([1, 0, 0], [1e8, 2, 0], [1, -1, 1])
+        self.assertEqual(solutions.x1[0], -1e-8)
+        self.assertEqual(solutions.x1[1], 0.5)
+        self.assertNotEqual(solutions.x1[2], solutions.x1[2])
+
+    def test_aberth(self):
+        random = Random(4)
+        for degree in [5, 12, 30]:
+            roots = set()
+            while len(roots) < degree:
+                roots.add(complex(random.randint(-9, 9), random.randint(-9, 9)) / 4)
+            polynomial = self.polynomial(' * '.join(f'(x - ({x.real} + {x.imag}i))' for x in roots) + ' = 0')
+            found = [complex(x.real, x.imag) for x in polynomial.resolve()]
+            with self.subTest(degree=degree):
+                self.assertEqual(len(found), degree)
+                for x in roots:
+                    self.assertLess(min(abs(x - y) for y in found), DEFAULT_ERROR)
+
+        # Roots at zero, high degrees
+        self.assertEqual(aberth([ZERO, ZERO, -ONE, ZERO, ZERO, ZERO, ZERO, ONE])[:2], [0j, 0j])
+        coeffs = [Complex(random.randint(-9, 9)) for _ in range(300)] + [ONE]
+        found = aberth(coeffs)
+        self.assertEqual(len(set(found)), 300)
+        self.assertLess(max(abs(newton_step([complex(x.real) for x in coeffs], x)) for x in found), 1e-9)
+
+    def test_immutable(self):
+        polynomial = self.polynomial('x^2 + 2 * x = 3')
+        with self.assertRaises(AttributeError):
+            polynomial.terms = ()
+        self.assertIs(polynomial.terms_reduced, polynomial.terms_reduced)
+
+    def test_equality(self):
+        first, second = self.polynomial('x^2 + 2 * x = 3'), self.polynomial('2 * x * 1 - 3 + x * x = 0')
+        self.assertEqual(first, second)
+        self.assertEqual(hash(first), hash(second))
+        self.assertNotEqual(first, self.polynomial('x^2 + 2 * x = 4'))
+        self.assertEqual(len({first, second, self.polynomial('x = 0')}), 2)
+
+    def test_sparse(self):
+        polynomial = self.polynomial(' + '.join(f'{n} * x^{n % 3} * y' for n in range(100)) + ' = y * x * y / y')
+        self.assertEqual(polynomial.names, ('x', 'y'))
+        self.assertEqual(polynomial.monomials, {(0, 1): 1683, (1, 1): 1616, (2, 1): 1650})
+        self.assertEqual(self.polynomial('x^2 * x^-2 = x / x').monomials, {})
+        self.assertEqual(self.polynomial('x^2 * x^-2 = x / x').variables_non_zero, ['x'])
+
+    def test_power(self):
+        polynomial = self.polynomial('(x + 1)^5 = 0')
+        self.assertEqual(polynomial.monomials, {(n,): c for n, c in enumerate([1, 5, 10, 10, 5, 1])})
+        self.assertEqual(self.polynomial('(x - y)^3 = (y - x)^3 * -1').monomials, {})
+        with self.assertRaises(MathError):
+            self.polynomial('x + y + 1 = 0').power(4, max_terms=10)
+        # Coefficients too big, whatever the degree
+        for s in ['(x - x + 2)^10000000 = 0', '(2 * x * y)^10000000 = 0']:
+            with self.subTest(s), self.assertRaises(MathError):
+                self.polynomial(s)
+
+    def test_expansions(self):
+        for s, power in [('2 * x - 3', 7), ('x^2 + 3 * x + 1', 9), ('x + y', 5), ('x + y + z + 1', 6),
+                         ('x^-1 + x', 3), ('x * y + x^-1 + 3 + y', 5), ('x * y + x + y + z + 2', 4)]:
+            with self.subTest(s, power=power):
+                base = self.polynomial(f'{s} = 0')
+                expected = base
+                for _ in range(power - 1):
+                    expected = expected * base
+                self.assertEqual(base ** power, expected)
+        self.assertEqual(self.polynomial('(2 * x - 3)^5000 = 0').dense.coeffs[5000], 2 ** 5000)
+
+
+class TestRational(unittest.TestCase):
+    def test_factorize(self):
+        for n in [1, 97, 720720, 600851475143, (2 ** 31 - 1) * (2 ** 61 - 1), 10 ** 30 + 1]:
+            with self.subTest(n=n):
+                factors = factorize(n)
+                self.assertEqual(prod(prime ** exponent for prime, exponent in factors.items()), n)
+                self.assertTrue(all(is_probable_prime(x) for x in factors))
+                if n < 10 ** 6:
+                    self.assertEqual(divisors(n), [x for x in range(1, n + 1) if n % x == 0])
+
+    def test_square_free(self):
+        # (x + 1)^5·(7x^2 + 2x - 3)
+        coeffs = [-3, -13, -13, 25, 75, 77, 37, 7]
+        self.assertFalse(is_square_free(coeffs))
+        self.assertEqual(square_free(coeffs), [([-3, 2, 7], 1), ([1, 1], 5)])
+        self.assertEqual(exact_roots([Fraction(1, 2), 0, -2]), ([Fraction(-1, 2), Fraction(1, 2)], []))
+        self.assertEqual(rational_roots([2, 3, 1]), ([-2, -1], [1]))
+        self.assertEqual(rational_roots([1, 0, 1]), ([], [1, 0, 1]))
+
+
+class TestDense(PolynomialFixture, unittest.TestCase):
+    def test_dense(self):
+        polynomial = self.polynomial('(x - 1) * (x + 2) / 2 = x^3 * 0')
+        self.assertEqual(polynomial.dense.coeffs, [-1, 0.5, 0.5])
+        self.assertEqual(polynomial.terms_reduced, (Term(-1, []), Term(0.5, [Variable('x', 1)]),
+                                                    Term(0.5, [Variable('x', 2)])))
+        self.assertEqual(polynomial.dense.evaluate(3), 5)
+
+    def test_sparse_only(self):
+        for s in ['x * y = 1', 'x^-1 + x = 0', 'x^0.5 = 2']:
+            with self.subTest(s):
+                self.assertIsNone(self.polynomial(s).dense)
+
+    def test_same_as_sparse(self):
+        dense = self.polynomial('(x + 1)^4 - 3 * x / 2 = x^2')
+        sparse = Polynomial(names=dense.names, monomials=dense.monomials)
+        self.assertEqual(dense, sparse)
+        self.assertEqual(dense.solution_text, sparse.solution_text)
+
+    def test_overflow(self):
+        for s in ['(2.5 * x)^99999 = 0', '(2.5 * x + 1)^9999 = 0']:
+            with self.subTest(s), self.assertRaises(MathError):
+                self.polynomial(s)
+
+
+class TestConvolution(unittest.TestCase):
+    def test_same_products(self):
+        random = Random(7)
+        for label, coeff in [("ints", lambda: random.randint(-10 ** 30, 10 ** 30)),
+                             ("floats", lambda: random.choice([0, 0.5, -1.25, 3, 0.375])),
+                             ("complex", lambda: complex(random.randint(-5, 5), random.randint(-5, 5))),
+                             ("fractions", lambda: Fraction(random.randint(-9, 9), random.randint(1, 9)))]:
+            for n, m in [(1, 1), (3, 90), (64, 64), (100, 41)]:
+                a, b = [coeff() for _ in range(n)], [coeff() for _ in range(m)]
+                with self.subTest(label, n=n, m=m):
+                    expected = schoolbook(a, b)
+                    self.assertEqual(karatsuba(a, b), expected)
+                    self.assertEqual(convolve(a, b), expected)
+                    self.assertEqual(kronecker(a, b), expected)
+
+    def test_operators(self):
+        computor = Computor(symbols=symbols)
+        factor = '(' + ' + '.join(f'{n % 7 - 3} * x^{n}' for n in range(100)) + ')'
+        computor.parse(f'{factor} * {factor} = {factor}^2 + x^300')
+        self.assertEqual(computor.result.monomials, {(300,): -1})
+
+
+class TestStream(unittest.TestCase):
+    def compute(self, s, chunk_size):
+        computor = Computor(symbols=symbols)
+        computor.parse_stream(s[i:i + chunk_size] for i in range(0, len(s), chunk_size))
+        return computor.result.solution_text
+
+    def test_same_as_parse(self):
+        tests = [
+            '5 * X^0 + 4 * X^1 - 9.3 * X^2 = 1 * X^0',
+            '1 - 2 * (5 * X^(49 - 48) - 3 * X^(1 + 1)) = 10 + -3 * (X^1 + X^2)',
+            '(x + 5)^2 + (x - 5)^2 = 0',
+            'x/x=1',
+            ' + '.join(f'{n} * x^{n % 3}' for n in range(300)) + ' = x - x^2',
+        ]
+        for test in tests:
+            computor = Computor(symbols=symbols)
+            computor.parse(test)
+            for chunk_size in (1, 7, 4096):
+                with self.subTest(test[:50], chunk_size=chunk_size):
+                    self.assertEqual(self.compute(test, chunk_size), computor.result.solution_text)
+
+    def test_errors(self):
+        for test, error in [('x + 1', SyntaxError), ('x^2 = (x', SyntaxError), ('x + = 1', SyntaxError),
+                            ('x^2 = 0;', SyntaxError), ('x + 1 =', StopIteration)]:
+            with self.subTest(test):
+                with self.assertRaises(error):
+                    self.compute(test, 2)
+
+
+class TestBatch(unittest.TestCase):
+    def test_same_as_run(self):
+        lines = ['x^2 = 4\n', '\n', 'x^2 = (x\n', 'x = 2 * x + 1', '0 ^ -1 = x'] * 10
+        expected = [Computor(symbols=symbols).execute(line.strip()) for line in lines if line.strip()]
+        self.assertEqual(list(run_batch(lines, symbols=symbols, jobs=2, block_size=7)), expected)
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.computor = Computor(symbols=symbols, cache_size=2)
+
+    def execute(self, s):
+        self.computor.variables = {}
+        return self.computor.execute(s)
+
+    def test_normalized(self):
+        outputs = [self.execute(s) for s in ['x^2 + 2 * x = 3', '2*x+x^2=3', '3 = 2 * x + x ^ 2']]
+        self.assertEqual(len(set(outputs)), 2)
+        self.assertEqual((self.computor.cache.hits, self.computor.cache.misses), (1, 2))
+
+    def test_evictions(self):
+        for s in ['x = 1', 'x = 2', 'x = 3', 'x = 1']:
+            self.execute(s)
+        self.assertEqual((self.computor.cache.hits, self.computor.cache.evictions), (0, 2))
+
+    def test_variables(self):
+        computor = Computor(cache_size=2)
+        computor.parse('X = 1')
+        computor.variables = {}
+        computor.parse('X = 1')
+        self.assertEqual(computor.variables, {'x': Variable(name='X', degree=1)})
+        computor.variables = {'x': Real(2)}
+        computor.parse('X + 1')
+        self.assertEqual(computor.result, 3)
+        computor.variables = {'x': Real(3)}
+        computor.parse('X + 1')
+        self.assertEqual(computor.result, 4)
+        self.assertEqual(computor.cache.hits, 1)
+
+    def test_declared(self):
+        outputs = [self.computor.execute(s) for s in ['x^2 = 4', ' x^2=4 ', 'X^2 = 4']]
+        self.assertEqual(len(set(outputs)), 1)
+        self.assertEqual((self.computor.cache.hits, self.computor.cache.misses), (1, 2))
+
+
+class TestDiskCache(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'cache.db')
+
+    def test_shared(self):
+        output = Computor(symbols=symbols, cache_file=self.path).execute('x^2 + 2 * x = 3')
+        computor = Computor(cache_size=2, cache_file=self.path)
+        self.assertEqual(computor.execute('2*x+x^2=3'), output)
+        self.assertEqual(computor.variables, {'x': Variable(name='x', degree=1)})
+        self.assertEqual((computor.cache.parent.hits, computor.cache.parent.misses), (1, 0))
+
+    def test_evictions(self):
+        computor = Computor(symbols=symbols, cache_file=self.path)
+        computor.cache.size = 2
+        for s in ['x = 1', 'x = 2', 'x = 3']:
+            computor.variables = {}
+            computor.execute(s)
+        self.assertEqual((len(computor.cache), computor.cache.evictions), (2, 1))
+
+    def test_unsafe(self):
+        computor = Computor(symbols=symbols, cache_file=self.path)
+        output = computor.execute('x^2 = 4')
+        # A function, and a class only imported by a module of the mathematics package
+        for entry in [pickle.dumps(print), b"cmathematics.polynomial\narray\n(S'd'\ntR."]:
+            with computor.cache.connection:
+                computor.cache.connection.execute('UPDATE results SET entry = ?', (entry,))
+            self.assertEqual(computor.execute('x^2 = 4'), output)
+        self.assertEqual((computor.cache.hits, computor.cache.misses), (0, 3))
+
+    def test_batch(self):
+        lines = [f'x = {n % 3}' for n in range(12)]
+        outputs = list(run_batch(lines, symbols=symbols, jobs=2, cache_file=self.path))
+        self.assertEqual(outputs, [Computor(symbols=symbols).execute(line) for line in lines])
+        self.assertEqual(len(Computor(cache_file=self.path).cache), 3)
+
+
+class TestCompiler(unittest.TestCase):
+    def setUp(self):
+        self.computor = Computor(symbols=symbols)
+
+    def test_evaluate_many(self):
+        expression = self.computor.compile('x^2 - 3 * (x + -y)')
+        for x, y, result in [(0, 0, 0), (1, 2, 4), (3, 1, 3)]:
+            with self.subTest(x=x, y=y):
+                self.assertEqual(expression.evaluate({'x': Real(x), 'y': Real(y)}), result)
+
+    def test_same_as_parse(self):
+        text = '(x + 5)^2 + (x - 5)^2 = 0'
+        self.computor.parse(text)
+        compiled = self.computor.compile(text).evaluate({})
+        self.assertEqual(str(compiled), str(self.computor.result))
+
+    def test_cached(self):
+        self.assertIs(self.computor.compile('x = 1'), Computor(symbols=symbols).compile('x = 1'))
+
+    def test_backends(self):
+        self.assertEqual(Computor(symbols=symbols, backend=EXACT).compile('0.1 + 0.2').evaluate({}), Fraction(3, 10))
+        computor = Computor(symbols=symbols, backend=decimal(40))
+        computor.parse('2^0.5')
+        compiled = computor.compile('2^0.5').evaluate({})
+        self.assertIsInstance(compiled.real, Decimal)
+        self.assertEqual(compiled, computor.result)
+
+    def test_errors(self):
+        with self.assertRaises(SyntaxError):
+            self.computor.compile('x = 1;')
+        with self.assertRaises(ResolveError):
+            self.computor.compile('x + 1').evaluate({})
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -20,9 +20,9 @@ D_POSITIVE = "Discriminant is strictly positive, the two solutions are:"
 D_NEGATIVE = "Discriminant is strictly negative, the two solutions are:"
 D_ZERO = "Discriminant is zero, the solution is:"
 D_NONE = "The solution is:"
-BIG_DEGREE = "The polynomial degree is strictly greater than 2, I can't solve."
+D_MANY = "The solutions are:"
 SMALL_DEGREE = "The polynomial degree is strictly less than 0, I can't solve."
-ALL_NUMBERS = "All real numbers are solutions."
+ALL_NUMBERS = "All real numbers are solutions"
 NO_SOLUTION = "This equation has no solutions in our world."
 
 
@@ -56,8 +56,8 @@ class TestComputor(unittest.TestCase):
                     REDUCED.format('4 + 3 * X + 3 * X^2 = 0'),
                     DEGREE.format(2),
                     D_NEGATIVE,
-                    '-0.5 + 1.040832', 'i',
-                    '-0.5 - 1.040832', 'i',
+                    '-0.5 + 1.04083i',
+                    '-0.5 - 1.04083i',
                 ]
             },
             {
@@ -92,7 +92,8 @@ class TestComputor(unittest.TestCase):
                 'messages': [
                     REDUCED.format('5 - 6 * X - 5.6 * X^3 = 0'),
                     DEGREE.format(3),
-                    BIG_DEGREE,
+                    D_MANY,
+                    '0.615598',
                 ]
             },
             {